@@ -0,0 +1,759 @@
+import argparse
+import os
+import sys
+import threading
+import time
+import queue
+
+# Tk is imported on first use (see _import_tk) so the module stays importable
+# and fast on machines without a display.
+tk = ttk = messagebox = filedialog = None
+
+# Make the shared ``sortlab`` package at the repository root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from sortlab import (cache, cli, encoding, engine, export, incremental, index, loaders, pipeline,
+                     predict, profiling)
+
+# Sorted output written by the Export option, relative to the working directory
+EXPORT_DIR = "exports"
+EXPORT_FORMATS = {"Off": None, "CSV": ".csv", "CSV (gzip)": ".csv.gz"}
+# Ask before starting a run predicted to take longer than this
+PREDICT_WARN_SECONDS = 30
+# Rows the predictor samples (read from disk when the dataset is not cached yet)
+PREDICT_SAMPLE_ROWS = 5000
+# Modes without a prediction ask before quadratic sorts of more rows than this
+QUADRATIC_WARN_ROWS = 20000
+# Run modes: how rows are loaded and sorted
+RUN_MODES = {
+    "Standard": "load rows, then sort them",
+    "Incremental": "whole file, only appended rows are sorted",
+    "Pipelined": "sort batches while the file is still loading",
+    "Index only": "sort keys + offsets, rows read on demand",
+}
+
+
+def _import_tk():
+    global tk, ttk, messagebox, filedialog
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, messagebox as _messagebox, filedialog as _filedialog
+        tk, ttk, messagebox, filedialog = tkinter, _ttk, _messagebox, _filedialog
+
+# ---------------------- CSV loading and helpers ----------------------
+
+def find_csv_file():
+    # Prefer data/generated_data.csv, else look for generated_data.csv in cwd
+    cwd = os.path.abspath(os.getcwd())
+    candidates = [
+        os.path.join(cwd, "data", "generated_data.csv"),
+        os.path.join(cwd, "generated_data.csv"),
+    ]
+    for p in candidates:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+# ---------------------- GUI Application ----------------------
+
+class SortBenchmarkApp:
+    def __init__(self, root):
+        _import_tk()
+        self.root = root
+        root.title("Sorting Benchmark Tool")
+        root.geometry("900x600")
+        
+        # Set a modern theme if available
+        try:
+            root.tk.call('source', 'azure.tcl')
+            root.tk.call('set_theme', 'dark')
+        except:
+            # Apply custom styling
+            self._setup_custom_theme()
+        
+        # Configure root window
+        root.configure(bg='#1a1a1f')
+        
+        # Configure ttk styles
+        self.style = ttk.Style()
+        self.style.theme_use('clam')  # More modern theme
+        
+        # Configure colors
+        self.bg_color = '#1a1a1f'
+        self.fg_color = '#e8e8ec'
+        self.accent_color = '#5eead4'
+        self.secondary_bg = '#22222a'
+        self.highlight_color = '#5eead4'
+        
+        self._configure_styles()
+        
+        mainframe = ttk.Frame(root, padding="12 12 12 12")
+        mainframe.pack(fill=tk.BOTH, expand=True)
+        
+        # Controls
+        controls = ttk.LabelFrame(mainframe, text="⚙️  Controls", padding="12 8 12 8")
+        controls.pack(fill=tk.X, padx=6, pady=(0, 6))
+        
+        # Algorithm selection
+        alg_frame = ttk.Frame(controls)
+        alg_frame.grid(column=0, row=0, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(alg_frame, text="Algorithm:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.alg_var = tk.StringVar(value="Merge Sort")
+        alg_combo = ttk.Combobox(alg_frame, textvariable=self.alg_var, state="readonly",
+                                  values=["Bubble Sort", "Insertion Sort", "Merge Sort", "Heapsort", "Introsort",
+                                          "Counting Sort"], 
+                                  width=18, font=('Poppins', 9))
+        alg_combo.pack(pady=(4, 0))
+        
+        # Column selection
+        col_frame = ttk.Frame(controls)
+        col_frame.grid(column=1, row=0, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(col_frame, text="Column:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.col_var = tk.StringVar(value="ID")
+        col_combo = ttk.Combobox(col_frame, textvariable=self.col_var, state="readonly",
+                                 values=["ID", "FirstName", "LastName"], 
+                                 width=18, font=('Poppins', 9))
+        col_combo.pack(pady=(4, 0))
+        
+        # Rows input
+        rows_frame = ttk.Frame(controls)
+        rows_frame.grid(column=2, row=0, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(rows_frame, text="Rows (N):", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.n_var = tk.StringVar(value="10000")
+        n_entry = ttk.Entry(rows_frame, textvariable=self.n_var, width=12, font=('Poppins', 9))
+        n_entry.pack(pady=(4, 0))
+        
+        # Loader workers (1 = single-process load_csv; more only pays off on
+        # files spanning several loaders.CHUNK_BYTES ranges)
+        workers_frame = ttk.Frame(controls)
+        workers_frame.grid(column=3, row=0, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(workers_frame, text="Load workers:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.workers_var = tk.StringVar(value="1")
+        workers_combo = ttk.Combobox(workers_frame, textvariable=self.workers_var, state="readonly",
+                                     values=["1", "2", "4", "8", "16"],
+                                     width=6, font=('Poppins', 9))
+        workers_combo.pack(pady=(4, 0))
+        
+        # Profiler toggle (defaults to $SORTLAB_PROFILE)
+        prof_frame = ttk.Frame(controls)
+        prof_frame.grid(column=0, row=1, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(prof_frame, text="Profile:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.profile_var = tk.StringVar(value=profiling.default_mode())
+        prof_combo = ttk.Combobox(prof_frame, textvariable=self.profile_var, state="readonly",
+                                  values=list(profiling.MODES), width=18, font=('Poppins', 9))
+        prof_combo.pack(pady=(4, 0))
+        
+        # Run mode (see RUN_MODES); the hint under the combo describes the selection
+        mode_frame = ttk.Frame(controls)
+        mode_frame.grid(column=1, row=1, columnspan=2, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(mode_frame, text="Mode:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.mode_var = tk.StringVar(value="Standard")
+        mode_combo = ttk.Combobox(mode_frame, textvariable=self.mode_var, state="readonly",
+                                  values=list(RUN_MODES), width=18, font=('Poppins', 9))
+        mode_combo.pack(anchor=tk.W, pady=(4, 0))
+        self.mode_hint_var = tk.StringVar(value=RUN_MODES["Standard"])
+        ttk.Label(mode_frame, textvariable=self.mode_hint_var, font=('Poppins', 8),
+                  foreground='#8a8a96').pack(anchor=tk.W)
+        mode_combo.bind("<<ComboboxSelected>>",
+                        lambda e: self.mode_hint_var.set(RUN_MODES[self.mode_var.get()]))
+        
+        # Export the full sorted output
+        export_frame = ttk.Frame(controls)
+        export_frame.grid(column=3, row=1, columnspan=2, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(export_frame, text="Export:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        self.export_var = tk.StringVar(value="Off")
+        export_combo = ttk.Combobox(export_frame, textvariable=self.export_var, state="readonly",
+                                    values=list(EXPORT_FORMATS), width=12, font=('Poppins', 9))
+        export_combo.pack(pady=(4, 0))
+        
+        # Run button
+        run_frame = ttk.Frame(controls)
+        run_frame.grid(column=4, row=0, sticky=tk.W, padx=(0, 16), pady=4)
+        ttk.Label(run_frame, text=" ", font=('Poppins', 9)).pack(anchor=tk.W)  # Spacer
+        self.run_btn = ttk.Button(run_frame, text="▶ Run Benchmark", 
+                                  command=self.on_run, style="Accent.TButton")
+        self.run_btn.pack(pady=(4, 0))
+        
+        # CSV selection
+        csv_frame = ttk.Frame(controls)
+        csv_frame.grid(column=5, row=0, sticky=tk.W, pady=4)
+        ttk.Label(csv_frame, text="CSV File:", font=('Poppins', 9, 'bold')).pack(anchor=tk.W)
+        csv_btn_frame = ttk.Frame(csv_frame)
+        csv_btn_frame.pack(fill=tk.X, pady=(4, 0))
+        
+        self.csv_path = None
+        self.csv_path_var = tk.StringVar(value="No file selected")
+        self.select_btn = ttk.Button(csv_btn_frame, text="📂 Select CSV...", 
+                                     command=self.on_select_csv, width=15)
+        self.select_btn.pack(side=tk.LEFT)
+        
+        # Path display
+        self.path_label = ttk.Label(csv_btn_frame, textvariable=self.csv_path_var, 
+                                   font=('Poppins', 8), foreground='#8a8a96')
+        self.path_label.pack(side=tk.LEFT, padx=(8, 0))
+        
+        # Status area
+        status_frame = ttk.Frame(mainframe, padding="8 8 8 8")
+        status_frame.pack(fill=tk.X, padx=6, pady=6)
+        
+        # Status label with icon
+        status_header = ttk.Frame(status_frame)
+        status_header.pack(fill=tk.X, pady=(0, 8))
+        
+        ttk.Label(status_header, text="📊 Status:", 
+                 font=('Poppins', 10, 'bold')).pack(side=tk.LEFT)
+        self.status_var = tk.StringVar(value="Ready")
+        self.status_label = ttk.Label(status_header, textvariable=self.status_var, 
+                                     font=('Poppins', 10), foreground=self.highlight_color)
+        self.status_label.pack(side=tk.LEFT, padx=(8, 0))
+        
+        # Progress bar
+        progress_frame = ttk.Frame(status_frame)
+        progress_frame.pack(fill=tk.X)
+        
+        self.progress = ttk.Progressbar(progress_frame, length=400, mode='determinate',
+                                       style="Horizontal.TProgressbar")
+        self.progress.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+        
+        # Progress percentage label
+        self.progress_var = tk.StringVar(value="0%")
+        self.progress_label = ttk.Label(progress_frame, textvariable=self.progress_var,
+                                       font=('Poppins', 9), foreground='#8a8a96')
+        self.progress_label.pack(side=tk.RIGHT, padx=(0, 8))
+        
+        # Timings display
+        timing_frame = ttk.LabelFrame(mainframe, text="⏱️  Performance Metrics", 
+                                     padding="12 8 12 8")
+        timing_frame.pack(fill=tk.X, padx=6, pady=6)
+        
+        # Create timing labels with better styling
+        timing_grid = ttk.Frame(timing_frame)
+        timing_grid.pack(fill=tk.X)
+        
+        self.load_time_var = tk.StringVar(value="Load: -")
+        self.sort_time_var = tk.StringVar(value="Sort: -")
+        self.write_time_var = tk.StringVar(value="Write: -")
+        self.total_time_var = tk.StringVar(value="Total: -")
+        self.copy_var = tk.StringVar(value="Copied: -")
+        self.overlap_var = tk.StringVar(value="Overlap: -")
+        
+        ttk.Label(timing_grid, textvariable=self.load_time_var, 
+                 font=('Poppins', 10), padding="8 4 8 4").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Label(timing_grid, textvariable=self.sort_time_var, 
+                 font=('Poppins', 10), padding="8 4 8 4").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Label(timing_grid, textvariable=self.write_time_var, 
+                 font=('Poppins', 10), padding="8 4 8 4").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Label(timing_grid, textvariable=self.total_time_var, 
+                 font=('Poppins', 10, 'bold'), padding="8 4 8 4").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Label(timing_grid, textvariable=self.copy_var, 
+                 font=('Poppins', 10), padding="8 4 8 4").pack(side=tk.LEFT, padx=(0, 16))
+        ttk.Label(timing_grid, textvariable=self.overlap_var, 
+                 font=('Poppins', 10), padding="8 4 8 4").pack(side=tk.LEFT)
+        
+        # Results area
+        results_frame = ttk.LabelFrame(mainframe, text="📋 Results (First 10 sorted records)", 
+                                      padding="8 8 8 8")
+        results_frame.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        
+        # Treeview with scrollbar
+        tree_frame = ttk.Frame(results_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        cols = ("ID", "FirstName", "LastName")
+        self.tree = ttk.Treeview(tree_frame, columns=cols, show='headings', height=12)
+        
+        # Configure columns
+        col_widths = {"ID": 100, "FirstName": 200, "LastName": 200}
+        for c in cols:
+            self.tree.heading(c, text=c, anchor=tk.W)
+            self.tree.column(c, width=col_widths[c], minwidth=80, anchor=tk.W)
+        
+        # Add scrollbar
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Initialize timing variables
+        self.load_time = 0
+        self.sort_time = 0
+        self.write_time = 0
+        self.eta_deadline = None
+        
+        # Internal
+        self.msg_queue = queue.Queue()
+        self.worker_thread = None
+        # Loaded datasets, so sweeping algorithms/columns/smaller N skips the reload
+        self.dataset_cache = cache.DatasetCache()
+        self.predictor = predict.RuntimePredictor()
+        self.root.after(100, self._poll_queue)
+    
+    def _setup_custom_theme(self):
+        """Set up custom theme colors and styles"""
+        self.root.configure(bg='#1a1a1f')
+        
+    def _configure_styles(self):
+        """Configure ttk styles for a modern look"""
+        # Configure main styles
+        self.style.configure('TFrame', background=self.bg_color)
+        self.style.configure('TLabel', background=self.bg_color, foreground=self.fg_color)
+        self.style.configure('TLabelframe', background=self.bg_color, 
+                           foreground=self.fg_color, borderwidth=1, bordercolor='#3a3a46', relief='solid')
+        self.style.configure('TLabelframe.Label', background=self.bg_color, 
+                           foreground=self.highlight_color, font=('Poppins', 10, 'bold'))
+        
+        # Configure button styles
+        self.style.configure('TButton', font=('Poppins', 9), padding=6)
+        self.style.configure('Accent.TButton', background=self.accent_color, 
+                           foreground='#1a1a1f', font=('Poppins', 9, 'bold'))
+        self.style.map('Accent.TButton',
+                      background=[('active', '#7fffd6'), ('pressed', '#5eead4')])
+        
+        # Configure combobox
+        self.style.configure('TCombobox', fieldbackground='#2a2a34', 
+                           background='#2a2a34', padding=4, arrowcolor='#e8e8ec', foreground='#1a1a1f')
+        self.style.map('TCombobox', foreground=[('readonly', '#1a1a1f')])
+        
+        # Configure entry
+        self.style.configure('TEntry', padding=4, foreground='#1a1a1f')
+        
+        # Configure progress bar
+        self.style.configure('Horizontal.TProgressbar', background=self.accent_color,
+                           troughcolor=self.secondary_bg, borderwidth=0,
+                           lightcolor=self.accent_color, darkcolor=self.accent_color)
+        
+        # Configure treeview
+        self.style.configure('Treeview', background='#2a2a34', fieldbackground='#2a2a34',
+                           foreground='#e8e8ec', rowheight=25)
+        self.style.configure('Treeview.Heading', background=self.secondary_bg,
+                           foreground=self.fg_color, font=('Poppins', 9, 'bold'),
+                           relief='flat')
+        self.style.map('Treeview', background=[('selected', self.accent_color)])
+        
+        # Configure scrollbar
+        self.style.configure('Vertical.TScrollbar', background=self.secondary_bg,
+                           troughcolor=self.bg_color, borderwidth=0,
+                           arrowcolor=self.fg_color)
+
+    def on_run(self):
+        if self.worker_thread and self.worker_thread.is_alive():
+            messagebox.showinfo("Please wait", "A benchmark is already in progress.")
+            return
+        alg = self.alg_var.get()
+        col = self.col_var.get()
+        try:
+            N = int(self.n_var.get())
+            if N <= 0:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror("Invalid N", "Please provide a positive integer for N.")
+            return
+
+        # prefer user-selected CSV, else fall back to the default lookup
+        csv_path = getattr(self, 'csv_path', None) or find_csv_file()
+        if not csv_path:
+            messagebox.showerror("CSV not found",
+                                 "Select a CSV file using 'Select CSV...' or place `generated_data.csv` in `data/` or the project root.")
+            return
+
+        # Estimate the run before starting it; warn when it looks long
+        mode = self.mode_var.get()
+        prediction = None
+        if mode == "Standard":
+            try:
+                prediction = self._predict(csv_path, N, alg, col)
+            except (OSError, ValueError, TypeError, MemoryError):
+                prediction = None  # the run itself will report the problem
+        if prediction is None and alg in predict.QUADRATIC and N > QUADRATIC_WARN_ROWS:
+            # other modes (and failed predictions) fall back to the static O(n^2) guard
+            cont = messagebox.askyesno("Large Dataset Warning",
+                                       f"⚠️ {alg} with N={N:,} may take significant time.\n\n"
+                                       f"This is an O(n²) algorithm. Continue anyway?",
+                                       icon='warning')
+            if not cont:
+                return
+        if prediction and prediction['time'] > PREDICT_WARN_SECONDS:
+            cont = messagebox.askyesno("Long Run Warning",
+                                       f"⚠️ {alg} on {prediction['n']:,} rows by {col} is predicted to take "
+                                       f"~{predict.format_eta(prediction['time'])} and "
+                                       f"{engine.format_bytes(prediction['memory'])} of extra memory "
+                                       f"(disorder {prediction['disorder']:.2f}).\n\nContinue anyway?",
+                                       icon='warning')
+            if not cont:
+                return
+
+        # clear previous results
+        for it in self.tree.get_children():
+            self.tree.delete(it)
+        self.load_time_var.set("Load: -")
+        self.sort_time_var.set("Sort: -")
+        self.write_time_var.set("Write: -")
+        self.total_time_var.set("Total: -")
+        self.write_time = 0
+        self.copy_var.set("Copied: -")
+        self.overlap_var.set("Overlap: -")
+        self.status_var.set("Initializing...")
+        self.progress.config(mode='determinate')
+        self.progress['value'] = 0
+        self.progress_var.set("0%")
+
+        # Launch worker thread
+        workers = int(self.workers_var.get())
+        args = (csv_path, N, alg, col, workers, self.profile_var.get(), mode,
+                self.export_var.get(), prediction)
+        self.worker_thread = threading.Thread(target=self._worker, args=args, daemon=True)
+        self.worker_thread.start()
+
+    def _predict(self, csv_path, N, alg, col):
+        # Calibrates on first use per algorithm and key type (well under 100 ms)
+        # Runs on the Tk thread, so only a PREDICT_SAMPLE_ROWS prefix is ever keyed
+        # peek, not get: the run's own load is the one that counts as a hit or miss
+        cached = self.dataset_cache.peek(csv_path, N, limit=PREDICT_SAMPLE_ROWS)
+        if cached is not None:
+            n, sample = cached
+        else:
+            sample, _ = loaders.load_csv(csv_path, n_rows=min(N, PREDICT_SAMPLE_ROWS))
+            # a short sample means the file has fewer rows than N
+            n = N if len(sample) >= min(N, PREDICT_SAMPLE_ROWS) else len(sample)
+        if not sample:
+            return None
+        key_fn, dictionary = encoding.column_key(sample, col)
+        return self.predictor.predict(sample, alg, n=n, key=key_fn,
+                                      kind='code' if dictionary else None)
+
+    def _worker(self, csv_path, N, alg, col, workers=1, profile='off', mode="Standard",
+                export_fmt='Off', prediction=None):
+        ext = EXPORT_FORMATS.get(export_fmt)
+
+        def run():
+            if mode == "Incremental":
+                sorted_rows = self._incremental_benchmark(csv_path, N, alg, col, workers)
+            elif mode == "Pipelined":
+                # the merge streams into the export file, so nothing is left to export after
+                out_path = self._export_path(csv_path, col, ext) if ext else None
+                sorted_rows = self._pipelined_benchmark(csv_path, N, alg, col, workers, out_path)
+            elif mode == "Index only":
+                sorted_rows = self._index_benchmark(csv_path, N, alg, col, workers)
+            else:
+                sorted_rows = self._benchmark(csv_path, N, alg, col, workers, prediction)
+            try:
+                if sorted_rows and ext:
+                    self._export(sorted_rows, csv_path, col, ext)
+            finally:
+                if isinstance(sorted_rows, index.SortIndex):
+                    sorted_rows.close()
+
+        try:
+            _, report = profiling.profiled(run, mode=profile, name=f"{alg}-{col}-{N}")
+            if report:
+                self.msg_queue.put(("profile", report))
+        except Exception as e:
+            self.msg_queue.put(("error", str(e)))
+
+    def _benchmark(self, csv_path, N, alg, col, workers, prediction=None):
+        self.msg_queue.put(("status", "📥 Loading CSV data..."))
+        
+        def load_progress_cb(pct):
+            self.msg_queue.put(("progress", None))  # indeterminate
+        
+        load_timings = {}
+        if workers > 1 and not loaders.detect_compression(csv_path):
+            rows, load_time, hit = self.dataset_cache.load(
+                csv_path, N, loader=loaders.load_csv_parallel, workers=workers,
+                progress_callback=load_progress_cb)
+        else:
+            rows, load_time, hit = self.dataset_cache.load(
+                csv_path, N, progress_callback=load_progress_cb, timings=load_timings)
+        self.load_time = load_time
+        if hit:
+            self.msg_queue.put(("load_cached", load_time, self.dataset_cache.describe()))
+        else:
+            self.msg_queue.put(("load_time", load_time))
+        if load_timings.get('compression'):
+            self.msg_queue.put(("load_split", load_timings))
+        if len(rows) == 0:
+            self.msg_queue.put(("error", "No rows loaded from CSV."))
+            return
+
+        # sorting with progress callback
+        if prediction:
+            self.msg_queue.put(("eta", alg, prediction))
+        else:
+            self.msg_queue.put(("status", f"⚡ Sorting with {alg}..."))
+        start = time.perf_counter()
+
+        # names sort by order-preserving integer codes; encoding counts as sort time
+        key_fn, _ = encoding.column_key(rows, col)
+
+        def progress_cb(pct):
+            # pct in [0.0, 1.0]
+            self.msg_queue.put(("progress", pct))
+
+        # rows are owned by this worker, so sort them in place instead of copying
+        sorted_rows, stats = engine.sort(rows, alg, key=key_fn, inplace=True,
+                                         progress_callback=progress_cb)
+
+        sort_time = time.perf_counter() - start
+        self.sort_time = sort_time
+        self.msg_queue.put(("copy_stats", stats['copies'], stats['bytes_copied']))
+        self.msg_queue.put(("sort_done", sorted_rows[:10], sort_time))
+        if prediction:
+            self.msg_queue.put(("prediction", self.predictor.record(prediction, stats)))
+        return sorted_rows
+
+    def _incremental_benchmark(self, csv_path, N, alg, col, workers):
+        # N and workers do not apply: the saved state always covers the whole file
+        self.msg_queue.put(("status", f"♻️ Incremental sort with {alg}..."))
+
+        def progress_cb(pct):
+            self.msg_queue.put(("progress", pct))
+
+        sorted_rows, info = incremental.sort_incremental(csv_path, col, alg, progress_callback=progress_cb)
+        t = info['timings']
+        self.load_time = t['state_load'] + t['parse'] + t['state_save']
+        self.msg_queue.put(("load_time", self.load_time))
+        self.sort_time = t['sort'] + t['merge']
+        self.msg_queue.put(("sort_done", sorted_rows[:10], self.sort_time))
+        reused = "state reused" if info['reused'] else "no usable state, full sort"
+        self.msg_queue.put(("status", f"♻️ +{info['delta']:,} new rows merged into {info['previous']:,} "
+                                      f"({reused}; sort {t['sort']:.4f} s, merge {t['merge']:.4f} s)"))
+        return sorted_rows
+
+    def _pipelined_benchmark(self, csv_path, N, alg, col, workers, out_path=None):
+        # the workers setting is the number of sorter processes here (1 = one sorter thread)
+        self.msg_queue.put(("status", f"🔀 Loading and sorting batches with {alg}..."))
+
+        def progress_cb(pct):
+            self.msg_queue.put(("progress", pct))
+
+        sorted_rows, info = pipeline.pipeline_sort(csv_path, alg, col, n_rows=N, sorters=workers,
+                                                   progress_callback=progress_cb, out_path=out_path)
+        if not info['rows']:
+            self.msg_queue.put(("error", "No rows loaded from CSV."))
+            return
+        # load and sort overlap, so only the part of the sort after loading adds to the total;
+        # a streamed write overlaps the merge and counts as write time
+        write = info.get('write')
+        self.load_time = info['load']
+        self.sort_time = info['total'] - info['load'] - (write['time'] if write else 0.0)
+        self.msg_queue.put(("load_time", info['load']))
+        top10 = info['head'] if write else sorted_rows[:10]
+        self.msg_queue.put(("sort_done", top10, info['sort'] + info['merge']))
+        self.msg_queue.put(("overlap", info))
+        if write:
+            self.write_time = write['time']
+            self.msg_queue.put(("write_done", write))
+        return sorted_rows
+
+    def _index_benchmark(self, csv_path, N, alg, col, workers):
+        # only (key, offset) pairs are sorted; rows are read back for display/export
+        self.msg_queue.put(("status", f"🗂️ Building or loading the {col} index..."))
+
+        def progress_cb(pct):
+            self.msg_queue.put(("progress", pct))
+
+        sort_index, info = index.sorted_index(csv_path, col, alg, n_rows=N, progress_callback=progress_cb)
+        if not len(sort_index):
+            sort_index.close()
+            self.msg_queue.put(("error", "No rows loaded from CSV."))
+            return
+        self.load_time = info['load'] if info['reused'] else info['scan'] + info['save']
+        self.sort_time = 0.0 if info['reused'] else info['sort']
+        self.msg_queue.put(("load_time", self.load_time))
+        self.msg_queue.put(("sort_done", sort_index[:10], self.sort_time))
+        self.msg_queue.put(("index_done", info, sort_index.nbytes(), len(sort_index)))
+        return sort_index
+
+    def _export_path(self, csv_path, col, ext):
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(csv_path))[0]
+        return os.path.abspath(os.path.join(EXPORT_DIR, f"{stem}-sorted-{col}{ext}"))
+
+    def _export(self, rows, csv_path, col, ext):
+        # The table already shows the top 10; the full output is written here
+        path = self._export_path(csv_path, col, ext)
+        self.msg_queue.put(("status", f"💾 Writing {len(rows):,} rows..."))
+        stats = export.export(rows, path)
+        self.write_time = stats['time']
+        self.msg_queue.put(("write_done", stats))
+
+    def on_select_csv(self):
+        path = filedialog.askopenfilename(
+            title="Select CSV file", 
+            filetypes=[("CSV files", "*.csv *.csv.gz *.csv.bz2 *.csv.xz"), ("All files", "*")]
+        )
+        if path:
+            self.csv_path = path
+            # show a shortened path if it's long
+            display = path
+            if len(display) > 120:
+                display = '...' + display[-117:]
+            self.csv_path_var.set(display)
+            self.status_var.set(f"📄 Loaded: {os.path.basename(path)}")
+
+    def _poll_queue(self):
+        try:
+            while True:
+                msg = self.msg_queue.get_nowait()
+                self._handle_msg(msg)
+        except queue.Empty:
+            pass
+        self.root.after(100, self._poll_queue)
+
+    def _handle_msg(self, msg):
+        typ = msg[0]
+        if typ == 'status':
+            self.status_var.set(msg[1])
+            self.root.update_idletasks()
+        elif typ == 'progress':
+            pct = msg[1]
+            if pct is None:
+                # indeterminate progress - pulse animation
+                if self.progress['mode'] != 'indeterminate':
+                    self.progress.config(mode='indeterminate')
+                self.progress.start(10)
+                self.progress_var.set("Loading...")
+            else:
+                # determinate progress
+                if self.progress['mode'] != 'determinate':
+                    self.progress.config(mode='determinate')
+                    self.progress.stop()
+                self.progress['value'] = pct * 100
+                self.progress_var.set(f"{int(pct*100)}%")
+                eta = ""
+                if self.eta_deadline:
+                    eta = f" (ETA ~{predict.format_eta(max(0.0, self.eta_deadline - time.perf_counter()))})"
+                self.status_var.set(f"Processing... {int(pct*100)}%{eta}")
+            self.root.update_idletasks()
+        elif typ == 'eta':
+            alg, prediction = msg[1], msg[2]
+            self.eta_deadline = time.perf_counter() + prediction['time']
+            self.status_var.set(f"⚡ Sorting with {alg}... ETA ~{predict.format_eta(prediction['time'])}, "
+                                f"{engine.format_bytes(prediction['memory'])} extra")
+        elif typ == 'load_time':
+            t = msg[1]
+            self.load_time_var.set(f"📥 Load: {t:.4f} s")
+            self.status_var.set("CSV loaded, starting sort...")
+            self.root.update_idletasks()
+        elif typ == 'load_cached':
+            t, info = msg[1], msg[2]
+            self.load_time_var.set(f"📥 Load: {t:.4f} s (cache hit)")
+            self.status_var.set(f"CSV served from cache ({info}), starting sort...")
+        elif typ == 'load_split':
+            t = msg[1]
+            self.load_time_var.set(f"📥 Load: {t['total']:.4f} s "
+                                   f"({t['compression']} {t['decompress']:.4f} s + parse {t['parse']:.4f} s)")
+            self.status_var.set(f"CSV loaded ({loaders.describe_timings(t)}), starting sort...")
+        elif typ == 'copy_stats':
+            copies, nbytes = msg[1], msg[2]
+            self.copy_var.set(f"📑 Copied: {engine.format_bytes(nbytes)} ({copies} arrays)")
+        elif typ == 'sort_done':
+            if self.progress['mode'] == 'indeterminate':
+                self.progress.stop()
+            top10, t = msg[1], msg[2]
+            self.sort_time_var.set(f"⚡ Sort: {t:.4f} s")
+            total_time = self.load_time + self.sort_time
+            self.total_time_var.set(f"✅ Total: {total_time:.4f} s")
+            self.progress['value'] = 100
+            self.progress_var.set("100%")
+            self.status_var.set("✅ Benchmark complete!")
+            self.eta_deadline = None
+            
+            # Clear and insert new rows
+            for it in self.tree.get_children():
+                self.tree.delete(it)
+            for r in top10:
+                self.tree.insert('', tk.END, values=(
+                    r.get('ID', ''), 
+                    r.get('FirstName', ''), 
+                    r.get('LastName', '')
+                ))
+            self.root.update_idletasks()
+        elif typ == 'write_done':
+            stats = msg[1]
+            self.write_time_var.set(f"💾 Write: {stats['time']:.4f} s ({stats['mb_per_s']:.1f} MB/s)")
+            total_time = self.load_time + self.sort_time + self.write_time
+            self.total_time_var.set(f"✅ Total: {total_time:.4f} s")
+            self.status_var.set(f"✅ Exported {stats['rows']:,} rows to {os.path.basename(stats['path'])} "
+                                f"({engine.format_bytes(stats['file_bytes'])})")
+        elif typ == 'overlap':
+            info = msg[1]
+            self.overlap_var.set(f"🔀 Overlap: {info['overlap']:.4f} s")
+            self.status_var.set(f"✅ {info['batches']} batches sorted while loading, merged in "
+                                f"{info['merge']:.4f} s; wall {info['total']:.4f} s vs "
+                                f"{info['load'] + info['sort'] + info['merge']:.4f} s of load + sort + merge")
+        elif typ == 'index_done':
+            info, nbytes, n = msg[1], msg[2], msg[3]
+            self.copy_var.set(f"📑 Index: {engine.format_bytes(nbytes)} ({nbytes / n:.0f} B/row)")
+            if info['reused']:
+                self.status_var.set(f"✅ Served from the saved index in {info['load']:.4f} s")
+            else:
+                self.status_var.set(f"✅ Index built (scan {info['scan']:.4f} s, sort {info['sort']:.4f} s) "
+                                    f"and saved next to the CSV")
+        elif typ == 'profile':
+            self._show_profile(msg[1])
+        elif typ == 'prediction':
+            entry = msg[1]
+            self.status_var.set(f"✅ Benchmark complete! Predicted {predict.format_eta(entry['time'])}, "
+                                f"actual {predict.format_eta(entry['actual_time'])}")
+        elif typ == 'error':
+            self.eta_deadline = None
+            self.status_var.set("❌ Error")
+            self.progress_var.set("Failed")
+            messagebox.showerror("Error", msg[1], icon='error')
+        else:
+            # unknown
+            pass
+
+
+    def _show_profile(self, report):
+        """Pop up the top-N hot functions of a profiled run."""
+        win = tk.Toplevel(self.root)
+        win.title(f"Profile ({report['mode']})")
+        win.geometry("760x420")
+        win.configure(bg=self.bg_color)
+        frame = ttk.Frame(win, padding="8 8 8 8")
+        frame.pack(fill=tk.BOTH, expand=True)
+        calls = "Samples" if report['mode'] == 'sample' else "Calls"
+        cols = ("Function", calls, "Self (s)", "Cumulative (s)")
+        tree = ttk.Treeview(frame, columns=cols, show='headings', height=15)
+        for c, w in zip(cols, (400, 90, 100, 110)):
+            tree.heading(c, text=c, anchor=tk.W)
+            tree.column(c, width=w, anchor=tk.W)
+        for row in report['top']:
+            tree.insert('', tk.END, values=(row['function'], f"{row['calls']:,}",
+                                            f"{row['self']:.4f}", f"{row['cumulative']:.4f}"))
+        tree.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text=f"pstats: {report['pstats']}\ncollapsed: {report['collapsed']}",
+                  font=('Poppins', 8), foreground='#8a8a96').pack(anchor=tk.W, pady=(6, 0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sorting Benchmark Tool")
+    parser.add_argument('--headless', action='store_true',
+                        help='run one benchmark in the terminal instead of opening the GUI')
+    parser.add_argument('--csv', help='CSV file (default: data/generated_data.csv)')
+    cli.add_csv_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        try:
+            _import_tk()
+            root = tk.Tk()
+        except Exception as e:  # no tkinter build or no display
+            print(f"GUI unavailable ({e}); running headless.")
+        else:
+            SortBenchmarkApp(root)
+            root.mainloop()
+            return
+
+    csv_path = args.csv or find_csv_file()
+    if not csv_path:
+        parser.error("no CSV found; pass --csv")
+    cli.run_csv(csv_path, args.n or 10000, args.algorithm, args.column, args.workers,
+                args.descending, args.export)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,180 +1,38 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import time
-import random
+import argparse
+import os
+import sys
 import threading
 
-def bubble_sort_descending(arr):
-    """Sorts an array in descending order using bubble sort."""
-    start_time = time.time()
-    n = len(arr)
-    for i in range(n):
-        swapped = False
-        for j in range(0, n - i - 1):
-            if arr[j] < arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                swapped = True
-        if not swapped:
-            break
-    end_time = time.time()
-    return arr, end_time - start_time
-
-def selection_sort_descending(arr):
-    """Sorts an array in descending order using selection sort."""
-    start_time = time.time()
-    n = len(arr)
-    for i in range(n):
-        max_idx = i
-        for j in range(i + 1, n):
-            if arr[j] > arr[max_idx]:
-                max_idx = j
-        arr[i], arr[max_idx] = arr[max_idx], arr[i]
-    end_time = time.time()
-    return arr, end_time - start_time
-
-def insertion_sort_descending(arr):
-    """Sorts an array in descending order using insertion sort."""
-    start_time = time.time()
-    n = len(arr)
-    for i in range(1, n):
-        key = arr[i]
-        j = i - 1
-        while j >= 0 and arr[j] < key:
-            arr[j + 1] = arr[j]
-            j -= 1
-        arr[j + 1] = key
-    end_time = time.time()
-    return arr, end_time - start_time
-
-def merge_sort_descending(arr):
-    """Sorts an array in descending order using merge sort."""
-    start_time = time.time()
-
-    def merge(left, right):
-        result = []
-        i = j = 0
-        while i < len(left) and j < len(right):
-            if left[i] >= right[j]:
-                result.append(left[i])
-                i += 1
-            else:
-                result.append(right[j])
-                j += 1
-        result.extend(left[i:])
-        result.extend(right[j:])
-        return result
-
-    def merge_sort(arr):
-        if len(arr) <= 1:
-            return arr
-        mid = len(arr) // 2
-        left = merge_sort(arr[:mid])
-        right = merge_sort(arr[mid:])
-        return merge(left, right)
-
-    sorted_arr = merge_sort(arr)
-    end_time = time.time()
-    return sorted_arr, end_time - start_time
-
-def quicksort_descending(arr):
-    """Sorts an array in descending order using iterative quicksort."""
-    start_time = time.time()
-
-    def partition(arr, low, high):
-        pivot = arr[high]
-        i = low - 1
-        for j in range(low, high):
-            if arr[j] >= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
-
-    def quicksort(arr, low, high):
-        stack = []
-        stack.append((low, high))
-        while stack:
-            low, high = stack.pop()
-            if low < high:
-                pi = partition(arr, low, high)
-                stack.append((low, pi - 1))
-                stack.append((pi + 1, high))
-
-    quicksort(arr, 0, len(arr) - 1)
-    end_time = time.time()
-    return arr, end_time - start_time
-
-def random_quicksort_descending(arr):
-    """Sorts an array in descending order using randomized quicksort."""
-    start_time = time.time()
-
-    def partition(arr, low, high):
-        rand_pivot = random.randint(low, high)
-        arr[rand_pivot], arr[high] = arr[high], arr[rand_pivot]
-        pivot = arr[high]
-        i = low - 1
-        for j in range(low, high):
-            if arr[j] >= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
-
-    def quicksort(arr, low, high):
-        stack = []
-        stack.append((low, high))
-        while stack:
-            low, high = stack.pop()
-            if low < high:
-                pi = partition(arr, low, high)
-                stack.append((low, pi - 1))
-                stack.append((pi + 1, high))
-
-    quicksort(arr, 0, len(arr) - 1)
-    end_time = time.time()
-    return arr, end_time - start_time
-
-def counting_sort_descending(arr):
-    """Sorts an array in descending order using counting sort."""
-    start_time = time.time()
-    if not arr:
-        return arr, 0.0
-
-    max_val = max(arr)
-    min_val = min(arr)
-    range_of_elements = max_val - min_val + 1
-
-    count = [0] * range_of_elements
-    output = [0] * len(arr)
-
-    for num in arr:
-        count[num - min_val] += 1
-
-    for i in range(1, len(count)):
-        count[i] += count[i - 1]
-
-    for num in arr:
-        output[count[num - min_val] - 1] = num
-        count[num - min_val] -= 1
-
-    output.reverse()
-    end_time = time.time()
-    return output, end_time - start_time
-
-def read_dataset(filename):
-    """Reads a dataset from a text file."""
-    with open(filename, 'r') as file:
-        data = [int(line.strip()) for line in file if line.strip()]
-    return data
+# Tk is imported on first use (see _import_tk) so the module stays importable
+# and fast on machines without a display.
+tk = ttk = filedialog = messagebox = scrolledtext = None
+
+# Make the shared ``sortlab`` package at the repository root importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sortlab import cli, engine, export, profiling
+from sortlab.loaders import describe_timings, read_dataset
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset.txt")
+
+
+def _import_tk():
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, filedialog as _fd, messagebox as _mb, scrolledtext as _st
+        tk, ttk, filedialog, messagebox, scrolledtext = tkinter, _ttk, _fd, _mb, _st
+
 
 class SortingGUI:
     def __init__(self, root):
+        _import_tk()
         self.root = root
         self.root.title("Advanced Sorting Algorithm Comparator")
         self.root.geometry("950x750")
         self.root.minsize(800, 600)
         self.root.maxsize(1600, 1200)
         self.dataset = []
+        self.sorted_data = []
         self.sorting = False
 
         # Calculate responsive font sizes
@@ -260,8 +118,7 @@ class SortingGUI:
             self.algorithm_var = tk.StringVar()
             self.algorithm_combo = ttk.Combobox(algo_frame, textvariable=self.algorithm_var,
                                                state='readonly', width=25)
-            self.algorithm_combo['values'] = ('Bubble Sort', 'Selection Sort', 'Insertion Sort',
-                                            'Merge Sort', 'Quicksort', 'Random Quicksort', 'Counting Sort')
+            self.algorithm_combo['values'] = tuple(engine.ENGINES)
             self.algorithm_combo.current(0)
             self.algorithm_combo.grid(row=1, column=0, pady=(5, 0), sticky=(tk.W, tk.E))
 
@@ -289,8 +146,7 @@ class SortingGUI:
             self.algorithm_var = tk.StringVar()
             self.algorithm_combo = ttk.Combobox(algo_frame, textvariable=self.algorithm_var,
                                                state='readonly', width=22)
-            self.algorithm_combo['values'] = ('Bubble Sort', 'Selection Sort', 'Insertion Sort',
-                                            'Merge Sort', 'Quicksort', 'Random Quicksort', 'Counting Sort')
+            self.algorithm_combo['values'] = tuple(engine.ENGINES)
             self.algorithm_combo.current(0)
             self.algorithm_combo.grid(row=1, column=0, pady=(5, 0), sticky=tk.W)
 
@@ -302,6 +158,18 @@ class SortingGUI:
                                          command=self.sort_dataset, state=tk.DISABLED)
             self.sort_button.grid(row=1, column=0, pady=(5, 0), sticky=tk.W)
 
+        # Export button under the sort button, enabled once a sort has finished
+        self.export_button = ttk.Button(sort_frame, text="Export Sorted...",
+                                        command=self.export_sorted, state=tk.DISABLED)
+        self.export_button.grid(row=2, column=0, pady=(5, 0), sticky=(tk.W, tk.E))
+
+        # Profiler toggle under the algorithm picker (defaults to $SORTLAB_PROFILE)
+        ttk.Label(algo_frame, text="🔥 Profile", font=('Segoe UI', self.label_font_size, 'bold')).grid(row=2, column=0, pady=(10, 0), sticky=tk.W)
+        self.profile_var = tk.StringVar(value=profiling.default_mode())
+        self.profile_combo = ttk.Combobox(algo_frame, textvariable=self.profile_var,
+                                          state='readonly', values=profiling.MODES, width=22)
+        self.profile_combo.grid(row=3, column=0, pady=(5, 0), sticky=(tk.W, tk.E))
+
         # Progress frame with better styling
         progress_frame = ttk.Frame(main_frame, style='TFrame', relief='solid', borderwidth=1)
         progress_frame.grid(row=3, column=0, pady=(0, 20), sticky=(tk.W, tk.E))
@@ -356,17 +224,6 @@ class SortingGUI:
         # Bind resize event for dynamic responsiveness
         self.root.bind('<Configure>', self.on_window_resize)
 
-        # Sorting functions dictionary
-        self.sort_functions = {
-            'Bubble Sort': bubble_sort_descending,
-            'Selection Sort': selection_sort_descending,
-            'Insertion Sort': insertion_sort_descending,
-            'Merge Sort': merge_sort_descending,
-            'Quicksort': quicksort_descending,
-            'Random Quicksort': random_quicksort_descending,
-            'Counting Sort': counting_sort_descending,
-        }
-
     def on_window_resize(self, event):
         """Handle window resize events for dynamic responsiveness."""
         if event.widget == self.root and (event.width != self.root.winfo_width() or event.height != self.root.winfo_height()):
@@ -379,11 +236,14 @@ class SortingGUI:
 
     def load_dataset(self):
         filename = filedialog.askopenfilename(title="Select Dataset File",
-                                            filetypes=(("Text files", "*.txt"), ("All files", "*.*")))
+                                            filetypes=(("Text files", "*.txt *.txt.gz *.txt.bz2 *.txt.xz"),
+                                                       ("All files", "*.*")))
         if filename:
             try:
-                self.dataset = read_dataset(filename)
-                self.dataset_label.config(text=f"📊 Dataset loaded: {len(self.dataset):,} elements")
+                load_timings = {}
+                self.dataset = read_dataset(filename, timings=load_timings)
+                self.dataset_label.config(text=f"📊 Dataset loaded: {len(self.dataset):,} elements "
+                                               f"in {load_timings['total']:.4f} s ({describe_timings(load_timings)})")
                 self.sort_button.config(state=tk.NORMAL)
                 self.result_text.delete(1.0, tk.END)
                 self.time_label.config(text="")
@@ -415,6 +275,8 @@ class SortingGUI:
         self.sort_button.config(state=tk.DISABLED)
         self.load_button.config(state=tk.DISABLED)
         self.algorithm_combo.config(state=tk.DISABLED)
+        self.profile_combo.config(state=tk.DISABLED)
+        self.export_button.config(state=tk.DISABLED)
         self.progress_label.config(text=f"⚡ Processing with {algorithm}...")
         self.progress_bar.start()
         self.time_label.config(text="")
@@ -424,35 +286,113 @@ class SortingGUI:
         threading.Thread(target=self._perform_sort, args=(algorithm,), daemon=True).start()
 
     def _perform_sort(self, algorithm):
-        sort_func = self.sort_functions[algorithm]
-        sorted_data, time_taken = sort_func(self.dataset.copy())
-
-        # Update UI in main thread
-        self.root.after(0, lambda: self._update_ui_after_sort(sorted_data, time_taken, algorithm))
-
-    def _update_ui_after_sort(self, sorted_data, time_taken, algorithm):
+        # Out-of-place so the loaded dataset survives; the engine makes the only copy
+        outcome = None
+        try:
+            (sorted_data, stats), report = profiling.profiled(
+                engine.sort, self.dataset, algorithm, reverse=True,
+                mode=self.profile_var.get(), name=f"{algorithm}-{len(self.dataset)}")
+            outcome = lambda: self._update_ui_after_sort(sorted_data, stats, algorithm, report)
+        except Exception as e:
+            # e.g. Counting Sort over a key range too wide for its memory ceiling, or a
+            # profiler that cannot start; bind the message now, ``e`` is unbound after
+            msg = str(e) or type(e).__name__
+            outcome = lambda: self._sort_failed(algorithm, msg)
+        finally:
+            # Update UI in main thread; the controls come back whatever happened
+            self.root.after(0, lambda: self._sort_finished(outcome))
+
+    def _sort_finished(self, outcome=None):
         self.progress_bar.stop()
         self.progress_label.config(text="")
         self.sort_button.config(state=tk.NORMAL)
         self.load_button.config(state=tk.NORMAL)
         self.algorithm_combo.config(state='readonly')
+        self.profile_combo.config(state='readonly')
+        self.export_button.config(state=tk.NORMAL)
         self.sorting = False
+        if outcome:
+            outcome()
+
+    def _sort_failed(self, algorithm, error):
+        messagebox.showerror("Error", f"{algorithm} failed: {error}")
+
+    def _update_ui_after_sort(self, sorted_data, stats, algorithm, report=None):
+        time_taken = stats['time']
+        self.sorted_data = sorted_data
 
         # Update time label
         self.time_label.config(text=f"⏱️ {algorithm} completed in {time_taken:.6f} seconds")
 
         # Update stats
-        self.stats_label.config(text=f"Algorithm: {algorithm} | Elements: {len(sorted_data):,}")
+        self.stats_label.config(text=f"Algorithm: {algorithm} | Elements: {len(sorted_data):,} | "
+                                     f"Copied: {engine.format_bytes(stats['bytes_copied'])} "
+                                     f"({stats['copies']} arrays)" +
+                                     (f" | Strategy: {stats['strategy']}" if 'strategy' in stats else ""))
 
         # Update results text
         self.result_text.delete(1.0, tk.END)
+        if report:
+            self.result_text.insert(tk.END, profiling.format_top(report) + "\n\n")
         self.result_text.insert(tk.END, f"🔽 Sorted in descending order using {algorithm}:\n\n")
 
         # Format the sorted data nicely - show all elements
         formatted_data = str(sorted_data).replace('[', '').replace(']', '')
         self.result_text.insert(tk.END, formatted_data)
 
+    def export_sorted(self):
+        if not self.sorted_data or self.sorting:
+            return
+        filename = filedialog.asksaveasfilename(title="Export Sorted Data", defaultextension=".txt",
+                                                filetypes=(("Text (one integer per line)", "*.txt"),
+                                                           ("Compressed text", "*.txt.gz"),
+                                                           ("Binary int64", "*.bin"),
+                                                           ("Compressed binary", "*.bin.gz"),
+                                                           ("CSV", "*.csv")))
+        if not filename:
+            return
+        self.export_button.config(state=tk.DISABLED)
+        self.progress_label.config(text=f"💾 Writing {len(self.sorted_data):,} elements...")
+        threading.Thread(target=self._perform_export, args=(filename,), daemon=True).start()
+
+    def _perform_export(self, filename):
+        try:
+            stats = export.export(self.sorted_data, filename)
+        except Exception as e:
+            msg = f"Failed to export: {e}"
+            self.root.after(0, lambda: messagebox.showerror("Error", msg))
+            stats = None
+        self.root.after(0, lambda: self._update_ui_after_export(stats))
+
+    def _update_ui_after_export(self, stats):
+        self.export_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="")
+        if stats:
+            self.stats_label.config(text=self.stats_label.cget('text') +
+                                    f"\nWrite: {stats['time']:.4f} s ({stats['mb_per_s']:.1f} MB/s, "
+                                    f"{engine.format_bytes(stats['file_bytes'])} to {os.path.basename(stats['path'])})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advanced Sorting Algorithm Comparator")
+    parser.add_argument('--headless', action='store_true',
+                        help='sort in the terminal instead of opening the GUI')
+    parser.add_argument('--dataset', default=DATASET, help='one integer per line')
+    cli.add_ints_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        try:
+            _import_tk()
+            root = tk.Tk()
+        except Exception as e:  # no tkinter build or no display
+            print(f"GUI unavailable ({e}); running headless.")
+        else:
+            SortingGUI(root)
+            root.mainloop()
+            return
+
+    cli.run_ints(args.dataset, args.algorithm, not args.ascending, args.export)
+
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    gui = SortingGUI(root)
-    root.mainloop()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""Sorting engines and helpers shared by the lab GUIs."""
+from .engine import ENGINES, STABLE_ENGINES, format_bytes, sort
+from .loaders import load_csv, load_csv_parallel
+from .timing import PhaseTimer, timed
+
+__all__ = ['ENGINES', 'PhaseTimer', 'STABLE_ENGINES', 'format_bytes', 'load_csv', 'load_csv_parallel',
+           'sort', 'timed']
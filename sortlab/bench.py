@@ -0,0 +1,535 @@
+"""Command line benchmarks for the shared sorting code.
+
+Run from the repository root, e.g.::
+
+    python -m sortlab.bench load --rows 10000000 --workers 1 4 16
+    python -m sortlab.bench incremental --rows 1000000 --deltas 1000 10000 100000
+    python -m sortlab.bench export --rows 1000000
+    python -m sortlab.bench decompress --rows 1000000
+    python -m sortlab.bench adversarial --n 3000 --runs 5
+    python -m sortlab.bench importtime --budget-ms 50
+    python -m sortlab.bench cache --rows 1000000 --sizes 1000000 100000 10000
+    python -m sortlab.bench predict --rows 200000 --column LastName
+    python -m sortlab.bench encoding --rows 1000000
+    python -m sortlab.bench pipeline --rows 1000000 --batch-rows 50000 --gzip
+    python -m sortlab.bench index --rows 1000000 --column LastName
+    python -m sortlab.bench distributed --rows 1000000 --workers 1 2 4
+    python -m sortlab.bench orderstat --n 1000000 --queries 1000
+"""
+import argparse
+import bisect
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import (cache, distributed, encoding, engine, export, incremental, index, loaders, orderstat,
+               pipeline, predict)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SAMPLE_CSV = os.path.join(REPO_ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+FALLBACK_NAMES = ['Bruce', 'John', 'Maria', 'Ana', 'Jose', 'Shiro', 'Reeves', 'Cruz', 'Reyes', 'Santos']
+
+
+def make_dataset(path, n_rows, seed=0):
+    """Write a ``generated_data.csv``-style file of ``n_rows`` random rows."""
+    rng = random.Random(seed)
+    first = last = FALLBACK_NAMES
+    if os.path.exists(SAMPLE_CSV):
+        with open(SAMPLE_CSV, newline='', encoding='utf-8') as f:
+            sample = list(csv.DictReader(f))
+        first = sorted({r['FirstName'] for r in sample})
+        last = sorted({r['LastName'] for r in sample})
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ID', 'FirstName', 'LastName'])
+        batch = []
+        for _ in range(n_rows):
+            batch.append((rng.randint(1000000, 9999999), rng.choice(first), rng.choice(last)))
+            if len(batch) >= 100000:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+    return path
+
+
+def dataset_for(rows, path=None):
+    """Return ``path`` (or a cached temp file name), generating it if missing."""
+    path = path or os.path.join(tempfile.gettempdir(), f'sortlab_bench_{rows}.csv')
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} rows into {path} ...")
+        make_dataset(path, rows)
+    return path
+
+
+def bench_load(args):
+    path = dataset_for(args.rows, args.csv)
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"{'loader':<22}{'rows':>12}{'time (s)':>12}{'MB/s':>10}{'rows/s':>14}")
+
+    def report(name, rows, t):
+        print(f"{name:<22}{len(rows):>12,}{t:>12.3f}{size_mb / t:>10.1f}{len(rows) / t:>14,.0f}")
+
+    rows, t = loaders.load_csv(path, n_rows=args.n)
+    report('load_csv', rows, t)
+    del rows
+    for w in args.workers:
+        rows, t = loaders.load_csv_parallel(path, n_rows=args.n, workers=w)
+        report(f'parallel x{w}', rows, t)
+        del rows
+
+
+def bench_incremental(args):
+    base = dataset_for(args.rows)
+    work = os.path.join(tempfile.gettempdir(), 'sortlab_bench_incremental.csv')
+    with open(base, 'rb') as src, open(work, 'wb') as dst:
+        dst.write(src.read())
+    state = incremental.state_path(work, args.column)
+    if os.path.exists(state):
+        os.remove(state)
+    rows, info = incremental.sort_incremental(work, args.column, args.algorithm)
+    print(f"initial sort of {info['total']:,} rows: {sum(info['timings'].values()):.3f} s")
+    print(f"{'delta':>10}{'total':>12}{'parse':>9}{'sort':>9}{'merge':>9}{'state':>9}"
+          f"{'incr (s)':>10}{'full (s)':>10}")
+    extra = os.path.join(tempfile.gettempdir(), 'sortlab_bench_delta.csv')
+    for d in args.deltas:
+        make_dataset(extra, d, seed=d)
+        with open(extra, 'rb') as src, open(work, 'ab') as dst:
+            src.readline()  # skip header
+            dst.write(src.read())
+        rows, info = incremental.sort_incremental(work, args.column, args.algorithm)
+        t = info['timings']
+        incr = sum(t.values())
+        start = time.perf_counter()
+        full, _ = loaders.load_csv(work)
+        engine.sort(full, args.algorithm, key=loaders.column_key(args.column), inplace=True)
+        full_time = time.perf_counter() - start
+        print(f"{d:>10,}{info['total']:>12,}{t['parse']:>9.3f}{t['sort']:>9.3f}{t['merge']:>9.3f}"
+              f"{t['state_load'] + t['state_save']:>9.3f}{incr:>10.3f}{full_time:>10.3f}")
+    os.remove(state)
+
+
+def bench_export(args):
+    rows, _ = loaders.load_csv(dataset_for(args.rows))
+    ids = [int(r['ID']) for r in rows]
+    out_dir = tempfile.mkdtemp(prefix='sortlab_export_')
+    print(f"{'file':<20}{'rows':>12}{'time (s)':>10}{'MB/s':>9}{'on disk':>12}")
+    for name, items in (('sorted.csv', rows), ('sorted.csv.gz', rows), ('sorted.txt', ids),
+                        ('sorted.txt.gz', ids), ('sorted.bin', ids), ('sorted.bin.gz', ids)):
+        path = os.path.join(out_dir, name)
+        st = export.export(items, path)
+        print(f"{name:<20}{st['rows']:>12,}{st['time']:>10.3f}{st['mb_per_s']:>9.1f}"
+              f"{engine.format_bytes(st['file_bytes']):>12}")
+        os.remove(path)
+    os.rmdir(out_dir)
+
+
+def bench_decompress(args):
+    import bz2
+    import gzip
+    import lzma
+    path = dataset_for(args.rows, args.csv)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    out_dir = tempfile.mkdtemp(prefix='sortlab_decompress_')
+    print(f"{'file':<16}{'on disk':>10}{'total':>9}{'read':>8}{'decomp':>9}{'wait':>8}{'parse':>9}  verdict")
+    for ext, compress in (('', None), ('.gz', gzip.compress), ('.bz2', bz2.compress), ('.xz', lzma.compress)):
+        target = os.path.join(out_dir, 'data.csv' + ext)
+        with open(target, 'wb') as f:
+            f.write(compress(raw) if compress else raw)
+        t = {}
+        loaders.load_csv(target, timings=t)
+        verdict = loaders.describe_timings(t).rpartition('(')[2].rstrip(')') if ext else 'plain'
+        print(f"{'data.csv' + ext:<16}{engine.format_bytes(os.path.getsize(target)):>10}{t['total']:>9.3f}"
+              f"{t['read']:>8.3f}{t['decompress']:>9.3f}{t['wait']:>8.3f}{t['parse']:>9.3f}  {verdict}")
+        os.remove(target)
+    os.rmdir(out_dir)
+
+
+def adversarial_inputs(n, seed=0):
+    """Inputs that hurt naive quicksort: presorted, reversed, equal keys, organ pipe."""
+    rng = random.Random(seed)
+    half = n // 2
+    return {
+        'random': [rng.randint(0, n) for _ in range(n)],
+        'sorted': list(range(n)),
+        'reversed': list(range(n, 0, -1)),
+        'all equal': [7] * n,
+        'few unique': [rng.randint(0, 3) for _ in range(n)],
+        'organ pipe': list(range(half)) + list(range(n - half, 0, -1)),
+    }
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def bench_adversarial(args):
+    inputs = adversarial_inputs(args.n)
+    print(f"n={args.n:,}, {args.runs} runs each, times in ms")
+    print(f"{'input':<12}{'algorithm':<18}{'p50':>10}{'p95':>10}{'max':>10}")
+    for name, data in inputs.items():
+        for alg in args.algorithms:
+            times = []
+            for _ in range(args.runs):
+                _, stats = engine.sort(data, alg, reverse=args.reverse)
+                times.append(stats['time'] * 1000)
+            print(f"{name:<12}{alg:<18}{_percentile(times, 50):>10.1f}{_percentile(times, 95):>10.1f}"
+                  f"{max(times):>10.1f}")
+
+
+def bench_cache(args):
+    path = dataset_for(args.rows, args.csv)
+    ds_cache = cache.DatasetCache()
+    print(f"{'N':>12}{'cold load (s)':>16}{'cached (s)':>14}{'speedup':>10}")
+    for n in args.sizes:
+        _, cold = loaders.load_csv(path, n_rows=n)
+        rows, t, hit = ds_cache.load(path, n)
+        if not hit:
+            rows, t, hit = ds_cache.load(path, n)
+        print(f"{n:>12,}{cold:>16.4f}{t:>14.6f}{cold / t:>9.0f}x")
+    print(ds_cache.describe())
+
+
+def bench_predict(args):
+    path = dataset_for(args.rows, args.csv)
+    rows, _ = loaders.load_csv(path)
+    # same keys as the benchmark tool: name columns sort by dictionary codes
+    key, dictionary = encoding.column_key(rows, args.column)
+    kind = 'code' if dictionary else None
+    predictor = predict.RuntimePredictor(log_path=args.log)
+    print(f"{'algorithm':<18}{'n':>10}{'predicted':>12}{'actual':>12}{'ratio':>8}{'memory ok':>11}")
+    for alg in args.algorithms:
+        sizes = args.quadratic_sizes if alg in predict.QUADRATIC else args.sizes
+        for n in sizes:
+            data = rows[:n]
+            pred = predictor.predict(data[:args.sample], alg, n=len(data), key=key, inplace=False,
+                                     kind=kind)
+            _, stats = engine.sort(data, alg, key=key)
+            entry = predictor.record(pred, stats)
+            print(f"{alg:<18}{len(data):>10,}{pred['time']:>12.4f}{stats['time']:>12.4f}"
+                  f"{entry['time_ratio']:>8.2f}{str(pred['memory'] == stats['bytes_copied']):>11}")
+    print(f"logged to {predictor.log_path}")
+    for alg, acc in predict.summarize(predictor.log_path).items():
+        print(f"  {alg:<18}{acc['runs']:>4} runs, median ratio {acc['median']:.2f}, worst {acc['worst']:.2f}")
+
+
+def _compare_ns(keys, pairs=200000, seed=0):
+    """Mean ns per ``<`` between decorated ``(key, position, row)`` tuples."""
+    rng = random.Random(seed)
+    picks = [(rng.randrange(len(keys)), rng.randrange(len(keys))) for _ in range(pairs)]
+    decorated = [(k, i, None) for i, k in enumerate(keys)]
+    start = time.perf_counter()
+    for i, j in picks:
+        decorated[i] < decorated[j]
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    for i, j in picks:
+        pass
+    return max(0.0, loop - (time.perf_counter() - start)) / pairs * 1e9
+
+
+def bench_encoding(args):
+    path = dataset_for(args.rows, args.csv)
+    rows, _ = loaders.load_csv(path, n_rows=args.n)
+    print(f"{len(rows):,} rows; sort times include building the key (and dictionary)")
+    print(f"{'column':<11}{'algorithm':<16}{'lower() s':>11}{'codes s':>10}{'speedup':>9}")
+    for col in args.columns:
+        start = time.perf_counter()
+        key, dictionary = encoding.column_key(rows, col)
+        build = time.perf_counter() - start
+        lower_key = loaders.column_key(col)
+        lower_ns = _compare_ns([lower_key(r) for r in rows])
+        code_ns = _compare_ns([key(r) for r in rows])
+        print(f"{col}: {len(dictionary):,} distinct names, dictionary built in {build:.4f} s, "
+              f"compare {lower_ns:.0f} ns (str) vs {code_ns:.0f} ns (code)")
+        for alg in args.algorithms:
+            lower_t = None  # string keys are not countable
+            if alg not in engine.DISTRIBUTION_ENGINES:
+                _, stats = engine.sort(rows, alg, key=lower_key)
+                lower_t = stats['time']
+            start = time.perf_counter()
+            key, _ = encoding.column_key(rows, col)
+            engine.sort(rows, alg, key=key)
+            code_t = time.perf_counter() - start
+            lower = 'n/a' if lower_t is None else f"{lower_t:.4f}"
+            speedup = 'n/a' if lower_t is None else f"{lower_t / code_t:.2f}x"
+            print(f"{'':<11}{alg:<16}{lower:>11}{code_t:>10.4f}{speedup:>9}")
+
+
+def bench_pipeline(args):
+    import gzip
+    path = dataset_for(args.rows, args.csv)
+    if args.gzip:
+        gz_path = path + '.gz'
+        if not os.path.exists(gz_path):
+            with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+                dst.write(src.read())
+        path = gz_path
+    print(f"{os.path.basename(path)}, {args.algorithm} by {args.column}, batches of {args.batch_rows:,}")
+    print(f"{'mode':<22}{'load s':>9}{'sort s':>9}{'merge s':>9}{'overlap s':>11}{'wall s':>9}")
+
+    start = time.perf_counter()
+    rows, load_t = loaders.load_csv(path, n_rows=args.n)
+    _, stats = engine.sort(rows, args.algorithm, key=loaders.column_key(args.column), inplace=True)
+    wall = time.perf_counter() - start
+    print(f"{'sequential':<22}{load_t:>9.3f}{stats['time']:>9.3f}{0:>9.3f}{0:>11.3f}{wall:>9.3f}")
+    del rows
+    for sorters in args.sorters:
+        _, info = pipeline.pipeline_sort(path, args.algorithm, args.column, n_rows=args.n,
+                                         batch_rows=args.batch_rows, sorters=sorters)
+        print(f"{f'pipelined x{sorters}':<22}{info['load']:>9.3f}{info['sort']:>9.3f}{info['merge']:>9.3f}"
+              f"{info['overlap']:>11.3f}{info['total']:>9.3f}")
+
+
+def _peak_bytes(func):
+    """Peak traced allocation of one ``func()`` call under ``tracemalloc``."""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_index(args):
+    path = dataset_for(args.rows, args.csv)
+    idx_file = index.index_path(path, args.column)
+    print(f"{os.path.basename(path)} by {args.column} with {args.algorithm}")
+    print(f"{'mode':<18}{'time s':>9}{'peak MB':>10}{'B/row':>8}")
+
+    def drop_index():
+        if os.path.exists(idx_file):
+            os.remove(idx_file)
+
+    def full():
+        rows, _ = loaders.load_csv(path)
+        rows, _ = engine.sort(rows, args.algorithm, key=loaders.column_key(args.column), inplace=True)
+        return len(rows), rows[:10]
+
+    def indexed():
+        with index.sorted_index(path, args.column, args.algorithm)[0] as sort_index:
+            return len(sort_index), sort_index[:10]
+
+    tops = []
+    # each mode runs twice: once for time, once under tracemalloc for the peak
+    for name, func, before in (('rows in memory', full, None), ('index build', indexed, drop_index),
+                               ('saved index', indexed, None)):
+        if before:
+            before()
+        start = time.perf_counter()
+        n, top = func()
+        t = time.perf_counter() - start
+        if before:
+            before()
+        peak = _peak_bytes(func)
+        tops.append(top)
+        print(f"{name:<18}{t:>9.3f}{peak / 1e6:>10.1f}{peak / n:>8.0f}")
+    print(f"same top rows: {tops[0] == tops[1] == tops[2]}; "
+          f"index file {engine.format_bytes(os.path.getsize(idx_file))}")
+
+
+def bench_distributed(args):
+    path = dataset_for(args.rows, args.csv)
+    key = loaders.column_key(args.column)
+    start = time.perf_counter()
+    rows, _ = loaders.load_csv(path)
+    expected, _ = engine.sort(rows, args.algorithm, key=key, inplace=True)
+    local = time.perf_counter() - start
+    del rows
+    print(f"{os.path.basename(path)} by {args.column} with {args.algorithm}")
+    print(f"{'workers':<9}{'total s':>9}{'max sort s':>11}{'shuffle MB':>11}{'skew':>7}{'same':>6}")
+    print(f"{'local':<9}{local:>9.3f}")
+    procs, addresses = distributed.spawn_local_workers(max(args.workers))
+    try:
+        for n in args.workers:
+            result, report = distributed.distributed_sort(path, addresses[:n], args.algorithm,
+                                                          args.column)
+            slowest = max(node['sort'] for node in report['nodes'])
+            print(f"{n:<9}{report['total']:>9.3f}{slowest:>11.3f}"
+                  f"{report['shuffle_bytes'] / 1e6:>11.1f}{report['skew']:>7.2f}"
+                  f"{str(result == expected):>6}")
+            del result
+    finally:
+        distributed.stop_workers(addresses, procs)
+
+
+def bench_orderstat(args):
+    rng = random.Random(0)
+    values = [rng.randrange(args.n * 10) for _ in range(args.n)]
+    stats = orderstat.OrderStatistics()
+    start = time.perf_counter()
+    for v in values:
+        stats.add(v)
+    ingest = time.perf_counter() - start
+    print(f"ingest {args.n:,} values: {ingest:.3f} s ({args.n / ingest:,.0f} values/s)")
+
+    # the same median/top-K/rank questions, answered by re-sorting everything each time
+    resort_runs = max(1, min(args.queries, 20))
+    start = time.perf_counter()
+    for _ in range(resort_runs):
+        ordered = sorted(values)
+        ordered[len(ordered) // 2], ordered[-10:], bisect.bisect_left(ordered, args.n * 5)
+    resort = (time.perf_counter() - start) / resort_runs
+    print(f"{'query':<12}{'us/query':>10}{'vs re-sort':>12}")
+    for name, func in (('percentile', lambda: stats.percentile(rng.uniform(0, 100))),
+                       ('select', lambda: stats.select(rng.randrange(args.n))),
+                       ('rank', lambda: stats.rank(rng.randrange(args.n * 10))),
+                       ('top 10', lambda: stats.top(10))):
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            func()
+        per_query = (time.perf_counter() - start) / args.queries
+        print(f"{name:<12}{per_query * 1e6:>10.1f}{resort / per_query:>11,.0f}x")
+    print(f"re-sort per query: {resort * 1e3:.1f} ms")
+
+
+GUI_SCRIPTS = [os.path.join(REPO_ROOT, 'PRELIM-EXAM', 'src', 'main.py'),
+               os.path.join(REPO_ROOT, 'PRELIM-LAB-WORK-2', 'Sorting-Perez.py')]
+# Loads a GUI script without running it and reports whether Tk got imported.
+_LOAD_SCRIPT = ("import importlib.util, sys; "
+                "spec = importlib.util.spec_from_file_location('gui', sys.argv[1]); "
+                "spec.loader.exec_module(importlib.util.module_from_spec(spec)); "
+                "print('tkinter' in sys.modules)")
+
+
+def _import_ms(module):
+    """Cumulative ``-X importtime`` of ``module`` in a fresh interpreter, in ms."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def bench_importtime(args):
+    failed = False
+    print(f"{'module':<20}{'median ms':>10}{'budget':>10}")
+    for module in args.modules:
+        ms = sorted(_import_ms(module) for _ in range(args.runs))[args.runs // 2]
+        ok = ms <= args.budget_ms
+        failed |= not ok
+        print(f"{module:<20}{ms:>10.1f}{args.budget_ms:>10.0f}  {'ok' if ok else 'OVER BUDGET'}")
+    for script in GUI_SCRIPTS:
+        proc = subprocess.run([sys.executable, '-c', _LOAD_SCRIPT, script],
+                              capture_output=True, text=True, check=True)
+        tk_loaded = proc.stdout.strip() == 'True'
+        failed |= tk_loaded
+        print(f"{os.path.relpath(script, REPO_ROOT)}: tkinter imported at load: {tk_loaded}")
+    if failed:
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sortlab.bench', description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('load', help='load_csv vs load_csv_parallel throughput')
+    p.add_argument('--rows', type=int, default=10000000, help='rows in the generated file')
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--n', type=int, default=None, help='only load the first N rows')
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    p.set_defaults(func=bench_load)
+
+    p = sub.add_parser('incremental', help='incremental re-sort cost vs delta size')
+    p.add_argument('--rows', type=int, default=1000000, help='rows in the base file')
+    p.add_argument('--deltas', type=int, nargs='+', default=[1000, 10000, 100000])
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--algorithm', default='Merge Sort')
+    p.set_defaults(func=bench_incremental)
+
+    p = sub.add_parser('export', help='write throughput per export format')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.set_defaults(func=bench_export)
+
+    p = sub.add_parser('decompress', help='decompression vs parse time per codec')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this plain CSV instead of a generated one')
+    p.set_defaults(func=bench_decompress)
+
+    p = sub.add_parser('adversarial', help='latency distribution of quicksorts vs heapsort/introsort')
+    p.add_argument('--n', type=int, default=3000)
+    p.add_argument('--runs', type=int, default=5)
+    p.add_argument('--reverse', action='store_true', help='sort descending')
+    p.add_argument('--algorithms', nargs='+',
+                   default=['Quicksort', 'Random Quicksort', 'Heapsort', 'Introsort', 'Merge Sort'])
+    p.set_defaults(func=bench_adversarial)
+
+    p = sub.add_parser('cache', help='cold load vs dataset cache hit (largest size first)')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--sizes', type=int, nargs='+', default=[1000000, 100000, 10000])
+    p.set_defaults(func=bench_cache)
+
+    p = sub.add_parser('predict', help='predicted vs actual sort time, logged for accuracy tracking')
+    p.add_argument('--rows', type=int, default=200000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--sample', type=int, default=5000, help='rows the predictor sees')
+    p.add_argument('--sizes', type=int, nargs='+', default=[20000, 100000, 200000])
+    p.add_argument('--quadratic-sizes', type=int, nargs='+', default=[1000, 3000])
+    p.add_argument('--algorithms', nargs='+', default=list(engine.ENGINES))
+    p.add_argument('--log', help='prediction log (default SORTLAB_PREDICT_LOG or ./predictions.jsonl)')
+    p.set_defaults(func=bench_predict)
+
+    p = sub.add_parser('encoding', help='name columns: lower() keys vs dictionary codes')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--n', type=int, default=None, help='only load the first N rows')
+    p.add_argument('--columns', nargs='+', default=['FirstName', 'LastName'])
+    p.add_argument('--algorithms', nargs='+',
+                   default=['Merge Sort', 'Introsort', 'Heapsort', 'Counting Sort'])
+    p.set_defaults(func=bench_encoding)
+
+    p = sub.add_parser('pipeline', help='sequential load-then-sort vs pipelined load-and-sort')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--n', type=int, default=None, help='only load the first N rows')
+    p.add_argument('--gzip', action='store_true', help='read a gzip copy of the file')
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--algorithm', default='Merge Sort')
+    p.add_argument('--batch-rows', type=int, default=pipeline.BATCH_ROWS)
+    p.add_argument('--sorters', type=int, nargs='+', default=[1, 2])
+    p.set_defaults(func=bench_pipeline)
+
+    p = sub.add_parser('index', help='rows in memory vs index-only sort (time, peak memory)')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--algorithm', default='Merge Sort')
+    p.set_defaults(func=bench_index)
+
+    p = sub.add_parser('distributed', help='local sort vs sample sort on local worker processes')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--csv', help='use this CSV instead of a generated one')
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--algorithm', default='Merge Sort')
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    p.set_defaults(func=bench_distributed)
+
+    p = sub.add_parser('orderstat', help='streaming order statistics vs re-sorting per query')
+    p.add_argument('--n', type=int, default=1000000)
+    p.add_argument('--queries', type=int, default=1000)
+    p.set_defaults(func=bench_orderstat)
+
+    p = sub.add_parser('importtime', help='import cost of the package; fails over budget')
+    p.add_argument('--budget-ms', type=float, default=50.0)
+    p.add_argument('--runs', type=int, default=5)
+    p.add_argument('--modules', nargs='+', default=['sortlab', 'sortlab.engine', 'sortlab.cli'])
+    p.set_defaults(func=bench_importtime)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    args.func(args)
+    print(f"done in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Memory-budgeted LRU cache of loaded CSV datasets.
+
+Entries are keyed by ``(path, size, mtime)``, so a file that changed on
+disk is never served stale.  A request for N rows is a hit whenever the
+cached load already covers N rows (or the whole file): it is served as a
+prefix slice that shares the cached row dicts, so only the list of
+references is copied.  The copy is needed because the engines sort the
+list in place, and it keeps the cached prefix in file order.
+
+Entries are evicted least recently used first once their estimated
+resident size exceeds the budget (``SORTLAB_CACHE_MEMORY`` bytes, default
+512 MB).
+"""
+import collections
+import os
+import sys
+import threading
+import time
+
+from . import loaders
+
+CACHE_MEMORY_LIMIT = int(os.environ.get('SORTLAB_CACHE_MEMORY', 512 * 1024 * 1024))
+SIZE_SAMPLE = 256
+
+
+def file_key(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def estimate_bytes(rows, sample=SIZE_SAMPLE):
+    """Approximate resident size of a list of row dicts, from a sample of rows."""
+    if not rows:
+        return sys.getsizeof(rows)
+    step = max(1, len(rows) // sample)
+    picked = rows[::step][:sample]
+    per_row = sum(sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values())
+                  for r in picked) / len(picked)
+    return sys.getsizeof(rows) + int(per_row * len(rows))
+
+
+class DatasetCache:
+    """LRU cache of ``load_csv`` results, bounded by estimated resident size."""
+
+    def __init__(self, max_bytes=CACHE_MEMORY_LIMIT):
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._entries = collections.OrderedDict()  # key -> (rows, complete, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def resident_bytes(self):
+        return sum(nbytes for _, _, nbytes in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, path, n_rows=None):
+        """First ``n_rows`` rows (all if ``None``) if the cache covers them, else ``None``."""
+        key = file_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            rows, complete, _ = entry
+            if not complete and (n_rows is None or n_rows > len(rows)):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows[:n_rows]
+
+    def peek(self, path, n_rows=None, limit=None):
+        """``(n, head)`` if the cache covers the request, else ``None``.
+
+        ``n`` is how many rows ``get(path, n_rows)`` would return and
+        ``head`` the first ``limit`` of them.  Neither the hit/miss counts
+        nor the LRU order change, so a preview (e.g. sizing a prediction)
+        before the real ``load`` does not count the run twice.
+        """
+        key = file_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            rows, complete, _ = entry
+            if not complete and (n_rows is None or n_rows > len(rows)):
+                return None
+            n = len(rows) if n_rows is None else min(n_rows, len(rows))
+            return n, rows[:n if limit is None else min(n, limit)]
+
+    def put(self, path, rows, n_rows=None):
+        """Cache a fresh load of ``path`` that asked for ``n_rows`` rows.
+
+        Returns ``False`` if the load alone is over budget and was not kept.
+        """
+        key = file_key(path)
+        complete = n_rows is None or len(rows) < n_rows
+        nbytes = estimate_bytes(rows)
+        with self._lock:
+            # older loads of the same path are either stale or a shorter prefix
+            for old in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[old]
+            if nbytes > self.max_bytes:
+                return False
+            self._entries[key] = (rows, complete, nbytes)
+            while self.resident_bytes() > self.max_bytes:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def load(self, path, n_rows=None, loader=None, **loader_kwargs):
+        """Rows via the cache, else via ``loader`` (``load_csv`` by default).
+
+        Returns ``(rows, load_time, hit)``.  ``rows`` is always a new list the
+        caller may sort in place; the row dicts themselves are shared.
+        """
+        start = time.perf_counter()
+        rows = self.get(path, n_rows)
+        if rows is not None:
+            return rows, time.perf_counter() - start, True
+        loader = loader or loaders.load_csv
+        rows, load_time = loader(path, n_rows=n_rows, **loader_kwargs)
+        if self.put(path, rows, n_rows):
+            rows = rows[:]
+        return rows, load_time, False
+
+    def describe(self):
+        return (f"{len(self)} cached, {self.hits} hits / {self.misses} misses, "
+                f"~{self.resident_bytes() / 1e6:.1f} MB")
@@ -0,0 +1,105 @@
+"""Headless command line front end: no Tk import, no display needed.
+
+    python -m sortlab.cli csv PRELIM-EXAM/data/generated_data.csv --algorithm "Merge Sort" --column ID --n 10000
+    python -m sortlab.cli ints PRELIM-LAB-WORK-2/dataset.txt --algorithm Introsort
+
+Both GUI scripts fall back to these when started with ``--headless`` or
+when no display is available.
+"""
+import argparse
+import os
+
+from . import encoding, engine, export, loaders
+from .timing import PhaseTimer
+
+
+def run_csv(path, n=None, algorithm='Merge Sort', column='ID', workers=1, reverse=False,
+            export_path=None, show=10):
+    """Load, sort and optionally export a ``generated_data.csv``-style file."""
+    timer = PhaseTimer()
+    load_timings = {}
+    with timer.phase('load'):
+        if workers > 1:
+            rows, _ = loaders.load_csv_parallel(path, n_rows=n, workers=workers)
+        else:
+            rows, _ = loaders.load_csv(path, n_rows=n, timings=load_timings)
+    if not rows:
+        raise ValueError(f"No rows loaded from {path}")
+    with timer.phase('sort'):
+        key, _ = encoding.column_key(rows, column)
+        rows, stats = engine.sort(rows, algorithm, key=key, reverse=reverse, inplace=True)
+    if export_path:
+        with timer.phase('write'):
+            export.export(rows, export_path)
+
+    print(f"{algorithm} on {len(rows):,} rows by {column} "
+          f"({engine.format_bytes(stats['bytes_copied'])} copied)")
+    if load_timings.get('compression'):
+        print(f"load: {loaders.describe_timings(load_timings)}")
+    print(timer.summary())
+    fields = list(rows[0])
+    print('  '.join(f"{f:<12}" for f in fields))
+    for r in rows[:show]:
+        print('  '.join(f"{str(r.get(f, '')):<12}" for f in fields))
+    return rows, timer
+
+
+def run_ints(path, algorithm='Merge Sort', reverse=True, export_path=None, show=10):
+    """Sort a one-integer-per-line dataset (descending by default, like the comparator)."""
+    timer = PhaseTimer()
+    load_timings = {}
+    with timer.phase('load'):
+        data = loaders.read_dataset(path, timings=load_timings)
+    with timer.phase('sort'):
+        data, stats = engine.sort(data, algorithm, reverse=reverse, inplace=True)
+    if export_path:
+        with timer.phase('write'):
+            export.export(data, export_path)
+
+    order = 'descending' if reverse else 'ascending'
+    extra = f", strategy {stats['strategy']}" if 'strategy' in stats else ''
+    print(f"{algorithm} sorted {len(data):,} integers {order} "
+          f"({engine.format_bytes(stats['bytes_copied'])} copied{extra})")
+    print(f"load: {loaders.describe_timings(load_timings)}")
+    print(timer.summary())
+    print(', '.join(map(str, data[:show])) + (' ...' if len(data) > show else ''))
+    return data, timer
+
+
+def add_csv_arguments(p):
+    p.add_argument('--algorithm', default='Merge Sort', choices=list(engine.ENGINES))
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--n', type=int, default=None, help='only load the first N rows')
+    p.add_argument('--workers', type=int, default=1, help='parallel loader processes')
+    p.add_argument('--descending', action='store_true')
+    p.add_argument('--export', help='write the full sorted output here (.csv, .csv.gz)')
+
+
+def add_ints_arguments(p):
+    p.add_argument('--algorithm', default='Merge Sort', choices=list(engine.ENGINES))
+    p.add_argument('--ascending', action='store_true', help='default is descending')
+    p.add_argument('--export', help='write the sorted output here (.txt, .bin, .gz)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sortlab.cli', description="Headless sorting runs")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('csv', help='sort a generated_data.csv-style file')
+    p.add_argument('path')
+    add_csv_arguments(p)
+    p = sub.add_parser('ints', help='sort a one-integer-per-line dataset')
+    p.add_argument('path')
+    add_ints_arguments(p)
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.path):
+        parser.error(f"no such file: {args.path}")
+    if args.command == 'csv':
+        run_csv(args.path, args.n, args.algorithm, args.column, args.workers,
+                args.descending, args.export)
+    else:
+        run_ints(args.path, args.algorithm, not args.ascending, args.export)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""Distributed sample sort over TCP.
+
+A coordinator reads the input twice.  The first pass draws a reservoir
+sample of keys and picks ``workers - 1`` splitters at its quantiles.  The
+second pass range-partitions the items by key and streams each partition
+to its worker in batches.  Every worker sorts its partition with the
+chosen engine and sends it back.  Partitions are ordered by key range, so
+the result is the concatenation of the workers' outputs.  Equal keys
+always land on the same worker, so the sort stays stable.
+
+Workers are plain processes listening on a TCP port, so "nodes" can be
+other machines or, for testing on one box, local processes::
+
+    python -m sortlab.distributed worker --port 9001          # on each node
+    python -m sortlab.distributed sort data.csv --column LastName --connect host1:9001 host2:9001
+    python -m sortlab.distributed sort dataset.txt --workers 4   # spawns 4 local workers
+
+Frames are length-prefixed pickles: only connect workers and coordinators
+that trust each other (e.g. localhost or a private network).
+"""
+import argparse
+import bisect
+import csv
+import os
+import pickle
+import random
+import socket
+import struct
+import subprocess
+import sys
+import time
+
+from . import encoding, engine, export, loaders
+
+BATCH = 20000
+SAMPLES_PER_WORKER = 64
+_HEADER = struct.Struct('!Q')
+
+
+# ---------------------- Framing ----------------------
+
+def send_frame(sock, obj):
+    """Send one pickled object; returns the bytes put on the wire."""
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+    return _HEADER.size + len(payload)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed mid-frame")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_frame(sock):
+    """Receive one object; returns ``(obj, bytes read)``."""
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return pickle.loads(_recv_exact(sock, size)), _HEADER.size + size
+
+
+# ---------------------- Worker ----------------------
+
+def _handle(conn):
+    """Serve one sort request on ``conn``; returns ``False`` on shutdown."""
+    start = time.perf_counter()
+    msg, bytes_in = recv_frame(conn)
+    if msg[0] == 'shutdown':
+        return False
+    spec = msg[1]
+    items = []
+    while True:
+        msg, n = recv_frame(conn)
+        bytes_in += n
+        if msg[0] == 'end':
+            break
+        items.extend(msg[1])
+    recv_s = time.perf_counter() - start
+
+    # items are (key, payload) pairs when keyed, plain values otherwise
+    key = None
+    if spec['keyed'] and items and isinstance(items[0][0], str):
+        # name keys arrive as .lower() strings; sort this partition by their
+        # order-preserving codes so Counting Sort works on them too
+        codes = encoding.ColumnDictionary((pair[0] for pair in items), fold=str).codes
+        key = lambda pair: codes[pair[0]]
+    elif spec['keyed']:
+        key = lambda pair: pair[0]
+    try:
+        items, stats = engine.sort(items, spec['algorithm'], key=key,
+                                   reverse=spec['reverse'], inplace=True)
+    except Exception as e:
+        send_frame(conn, ('error', f"{type(e).__name__}: {e}"))
+        return True
+    if spec['keyed']:
+        items = [pair[1] for pair in items]
+
+    start = time.perf_counter()
+    bytes_out = 0
+    for i in range(0, len(items), BATCH):
+        bytes_out += send_frame(conn, ('rows', items[i:i + BATCH]))
+    send_s = time.perf_counter() - start
+    send_frame(conn, ('done', {'n': len(items), 'recv': recv_s, 'sort': stats['time'],
+                               'send': send_s, 'bytes_in': bytes_in, 'bytes_out': bytes_out}))
+    return True
+
+
+def serve_worker(host='127.0.0.1', port=0, ready=None):
+    """Accept sort requests one connection at a time until told to shut down.
+
+    Prints ``listening <port>`` once bound (``ready`` is called with the
+    port instead when given), so callers can use port 0.
+    """
+    with socket.create_server((host, port)) as server:
+        bound = server.getsockname()[1]
+        if ready:
+            ready(bound)
+        else:
+            print(f"listening {bound}", flush=True)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                if not _handle(conn):
+                    return
+
+
+def spawn_local_workers(n, host='127.0.0.1'):
+    """Start ``n`` worker processes on this machine; returns ``(procs, addresses)``."""
+    procs, addresses = [], []
+    # run from the directory holding the package so ``-m sortlab...`` resolves
+    # whatever the caller's working directory is
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for _ in range(n):
+        proc = subprocess.Popen([sys.executable, '-m', 'sortlab.distributed', 'worker',
+                                 '--host', host, '--port', '0'],
+                                stdout=subprocess.PIPE, text=True, cwd=package_root)
+        line = proc.stdout.readline().split()
+        if len(line) != 2 or line[0] != 'listening':
+            proc.kill()
+            proc.wait()
+            stop_workers(addresses, procs)
+            raise RuntimeError("local worker failed to start")
+        procs.append(proc)
+        addresses.append((host, int(line[1])))
+    return procs, addresses
+
+
+def stop_workers(addresses, procs=()):
+    for address in addresses:
+        try:
+            with socket.create_connection(address, timeout=5) as sock:
+                send_frame(sock, ('shutdown',))
+        except OSError:
+            pass
+    for proc in procs:
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ---------------------- Coordinator ----------------------
+
+def iter_items(path, column=None):
+    """Stream ``(key, item)`` pairs: CSV rows keyed by ``column``, or plain ints."""
+    if loaders.is_csv(path):
+        key = loaders.column_key(column or 'ID')
+        with loaders.open_dataset(path, newline='') as f:
+            for row in csv.DictReader(f):
+                yield key(row), row
+    else:
+        with loaders.open_dataset(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    value = int(line)
+                    yield value, value
+
+
+def choose_splitters(keys, parts):
+    """``parts - 1`` keys at the quantiles of the sorted sample ``keys``."""
+    keys = sorted(keys)
+    if not keys or parts <= 1:
+        return []
+    return [keys[len(keys) * i // parts] for i in range(1, parts)]
+
+
+def _sample_keys(path, column, size, seed=0):
+    rng = random.Random(seed)
+    sample = []
+    for i, (key, _) in enumerate(iter_items(path, column)):
+        if i < size:
+            sample.append(key)
+        else:
+            j = rng.randrange(i + 1)
+            if j < size:
+                sample[j] = key
+    return sample
+
+
+def distributed_sort(path, addresses, algorithm='Merge Sort', column=None, reverse=False,
+                     out_path=None, samples_per_worker=SAMPLES_PER_WORKER):
+    """Sample-sort ``path`` across the workers at ``addresses``.
+
+    Returns ``(rows, report)``; with ``out_path`` the sorted output is
+    streamed to that file (any ``export`` format) instead and ``rows`` is
+    ``None``.  ``report`` has the coordinator phase times, one entry per
+    node, total ``shuffle_bytes`` and partition ``skew`` (largest
+    partition over the mean; 1.0 is perfectly balanced).
+    """
+    parts = len(addresses)
+    keyed = loaders.is_csv(path)
+    report = {'workers': parts}
+    start = time.perf_counter()
+    splitters = choose_splitters(_sample_keys(path, column, samples_per_worker * parts), parts)
+    report['sample'] = time.perf_counter() - start
+
+    spec = {'algorithm': algorithm, 'reverse': reverse, 'keyed': keyed}
+    socks = [socket.create_connection(address) for address in addresses]
+    try:
+        shuffle = 0
+        counts = [0] * parts
+        buffers = [[] for _ in range(parts)]
+        start = time.perf_counter()
+        for sock in socks:
+            shuffle += send_frame(sock, ('sort', spec))
+        for key, item in iter_items(path, column):
+            p = bisect.bisect_right(splitters, key)
+            buffers[p].append((key, item) if keyed else item)
+            counts[p] += 1
+            if len(buffers[p]) >= BATCH:
+                shuffle += send_frame(socks[p], ('rows', buffers[p]))
+                buffers[p] = []
+        for p, sock in enumerate(socks):
+            if buffers[p]:
+                shuffle += send_frame(sock, ('rows', buffers[p]))
+            shuffle += send_frame(sock, ('end',))
+        report['partition'] = time.perf_counter() - start
+
+        # partitions hold ascending key ranges; descending output reads them backwards
+        start = time.perf_counter()
+        order = range(parts - 1, -1, -1) if reverse else range(parts)
+        rows = None if out_path else []
+        writer = export.Exporter(out_path) if out_path else None
+        nodes = [None] * parts
+        try:
+            for p in order:
+                while True:
+                    msg, n = recv_frame(socks[p])
+                    shuffle += n
+                    if msg[0] == 'error':
+                        raise RuntimeError(f"worker {addresses[p]}: {msg[1]}")
+                    if msg[0] == 'done':
+                        nodes[p] = dict(msg[1], node=f"{addresses[p][0]}:{addresses[p][1]}")
+                        break
+                    if writer:
+                        writer.write(msg[1])
+                    else:
+                        rows.extend(msg[1])
+        finally:
+            if writer:
+                report['write'] = writer.close()
+        report['gather'] = time.perf_counter() - start
+    finally:
+        for sock in socks:
+            sock.close()
+
+    mean = sum(counts) / parts if parts else 0
+    report.update(nodes=nodes, n=sum(counts), shuffle_bytes=shuffle, splitters=splitters,
+                  skew=max(counts) / mean if mean else 1.0)
+    report['total'] = report['sample'] + report['partition'] + report['gather']
+    return rows, report
+
+
+def format_report(report):
+    lines = [f"{report['n']:,} items on {report['workers']} workers, "
+             f"shuffled {engine.format_bytes(report['shuffle_bytes'])}, skew {report['skew']:.2f}",
+             f"coordinator: sample {report['sample']:.3f} s | partition+send {report['partition']:.3f} s"
+             f" | gather {report['gather']:.3f} s | total {report['total']:.3f} s",
+             f"{'node':<22}{'rows':>10}{'recv s':>9}{'sort s':>9}{'send s':>9}{'in':>11}{'out':>11}"]
+    for node in report['nodes']:
+        lines.append(f"{node['node']:<22}{node['n']:>10,}{node['recv']:>9.3f}{node['sort']:>9.3f}"
+                     f"{node['send']:>9.3f}{engine.format_bytes(node['bytes_in']):>11}"
+                     f"{engine.format_bytes(node['bytes_out']):>11}")
+    return '\n'.join(lines)
+
+
+def _address(text):
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sortlab.distributed',
+                                     description="Distributed sample sort over TCP")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('worker', help='run a worker node')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=0, help='0 picks a free port (printed on start)')
+    p = sub.add_parser('sort', help='coordinate a distributed sort')
+    p.add_argument('path', help='CSV (sorted by --column) or one-integer-per-line dataset')
+    p.add_argument('--connect', nargs='+', type=_address, metavar='HOST:PORT',
+                   help='existing workers; default is to spawn --workers local ones')
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--algorithm', default='Merge Sort', choices=list(engine.ENGINES))
+    p.add_argument('--column', default='ID', choices=['ID', 'FirstName', 'LastName'])
+    p.add_argument('--descending', action='store_true')
+    p.add_argument('--out', help='stream the sorted output here (.csv, .txt, .bin, .gz)')
+    p.add_argument('--top', type=int, default=5, help='rows to print when not writing --out')
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        try:
+            serve_worker(args.host, args.port)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    procs, addresses = [], args.connect
+    if not addresses:
+        procs, addresses = spawn_local_workers(args.workers)
+    try:
+        rows, report = distributed_sort(args.path, addresses, args.algorithm, args.column,
+                                        args.descending, args.out)
+    finally:
+        if procs:
+            stop_workers(addresses, procs)
+    print(format_report(report))
+    if rows is not None:
+        for row in rows[:args.top]:
+            print(row)
+    else:
+        print(f"wrote {report['write']['rows']:,} rows to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Order-preserving dictionary encoding of string columns.
+
+Name columns of ``generated_data.csv`` hold a few hundred distinct values
+across any number of rows.  ``ColumnDictionary`` lower-cases each distinct
+raw value once, sorts the distinct folded values and numbers them, so
+``code(a) < code(b)`` exactly when ``a.lower() < b.lower()``.  Engines then
+compare small ints instead of strings, and Counting Sort can sort name
+columns with a dense count array.
+
+Codes are only comparable within one dictionary: rebuild it (not reuse
+old codes) when the rows change.
+"""
+from . import loaders
+
+
+class ColumnDictionary:
+    """Order-preserving ``raw string -> int`` codes for one column."""
+
+    def __init__(self, raw_values, fold=str.lower):
+        raw = set(raw_values)
+        folded = {v: fold(v) for v in raw}
+        self.values = sorted(set(folded.values()))
+        rank = {v: i for i, v in enumerate(self.values)}
+        self.codes = {v: rank[f] for v, f in folded.items()}
+
+    def __len__(self):
+        return len(self.values)
+
+    def decode(self, code):
+        """Folded string for ``code``."""
+        return self.values[code]
+
+    @classmethod
+    def from_rows(cls, rows, col, fold=str.lower):
+        return cls(((r.get(col, '') or '') for r in rows), fold)
+
+    def key(self, col):
+        """Key function returning the code of ``row[col]``; rows must be covered."""
+        codes = self.codes
+        return lambda r: codes[r.get(col, '') or '']
+
+
+def column_key(rows, col):
+    """Like ``loaders.column_key`` but name columns sort by dictionary codes.
+
+    Builds the dictionary over ``rows``; the numeric ``ID`` column needs
+    no encoding and gets the plain key.  Returns ``(key, dictionary)``
+    where ``dictionary`` is ``None`` for ``ID``.
+    """
+    if col == 'ID':
+        return loaders.column_key(col), None
+    dictionary = ColumnDictionary.from_rows(rows, col)
+    return dictionary.key(col), dictionary
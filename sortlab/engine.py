@@ -0,0 +1,544 @@
+"""Shared sorting engines used by both lab GUIs.
+
+Every comparison engine sorts a list in place.  ``sort`` wraps them with the
+common ``key`` / ``reverse`` / ``inplace`` / ``stable`` options and reports how
+many element arrays a run had to allocate.
+"""
+import operator
+import os
+import random
+import struct
+import sys
+import time
+
+POINTER_SIZE = struct.calcsize('P')
+_DECORATED_SIZE = POINTER_SIZE + sys.getsizeof((0, 0, 0))
+
+
+def _new_stats(algorithm, n):
+    return {'algorithm': algorithm, 'n': n, 'copies': 0, 'bytes_copied': 0, 'time': 0.0}
+
+
+def _count_copy(stats, n, item_size=POINTER_SIZE):
+    """Record an auxiliary array of ``n`` items in ``stats``."""
+    if stats is not None:
+        stats['copies'] += 1
+        stats['bytes_copied'] += n * item_size
+
+
+def _progress_every(n):
+    # Update progress ~100 times max to avoid overhead
+    return max(1, n // 100)
+
+
+# ---------------------- Comparison engines (in place) ----------------------
+
+def bubble_sort(a, reverse=False, progress_callback=None, stats=None):
+    """Stable bubble sort with early exit."""
+    after = operator.lt if reverse else operator.gt
+    n = len(a)
+    every = _progress_every(n)
+    for i in range(n - 1):
+        swapped = False
+        for j in range(n - 1 - i):
+            if after(a[j], a[j + 1]):
+                a[j], a[j + 1] = a[j + 1], a[j]
+                swapped = True
+        if progress_callback and i % every == 0:
+            progress_callback((i + 1) / (n - 1))
+        if not swapped:
+            break
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+def selection_sort(a, reverse=False, progress_callback=None, stats=None):
+    """Unstable selection sort."""
+    better = operator.gt if reverse else operator.lt
+    n = len(a)
+    every = _progress_every(n)
+    for i in range(n):
+        best = i
+        for j in range(i + 1, n):
+            if better(a[j], a[best]):
+                best = j
+        a[i], a[best] = a[best], a[i]
+        if progress_callback and i % every == 0:
+            progress_callback((i + 1) / n)
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+def insertion_sort(a, reverse=False, progress_callback=None, stats=None):
+    """Stable insertion sort."""
+    after = operator.lt if reverse else operator.gt
+    n = len(a)
+    every = _progress_every(n)
+    for i in range(1, n):
+        item = a[i]
+        j = i - 1
+        while j >= 0 and after(a[j], item):
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = item
+        if progress_callback and i % every == 0:
+            progress_callback(i / max(1, n - 1))
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+def merge_sort(a, reverse=False, progress_callback=None, stats=None):
+    """Stable bottom-up merge sort using a single auxiliary buffer.
+
+    Runs are ping-ponged between ``a`` and the buffer instead of slicing, so
+    the only extra allocation is the buffer itself.
+    """
+    after = operator.lt if reverse else operator.gt
+    n = len(a)
+    if n <= 1:
+        if progress_callback:
+            progress_callback(1.0)
+        return a
+    buf = [None] * n
+    _count_copy(stats, n)
+    src, dst = a, buf
+    passes = (n - 1).bit_length()
+    width = 1
+    done = 0
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                # take from the right run only when strictly before the left one
+                if after(src[i], src[j]):
+                    dst[k] = src[j]
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            while i < mid:
+                dst[k] = src[i]
+                i += 1
+                k += 1
+            while j < hi:
+                dst[k] = src[j]
+                j += 1
+                k += 1
+        src, dst = dst, src
+        width *= 2
+        done += 1
+        if progress_callback:
+            progress_callback(min(0.99, done / passes))
+    if src is not a:
+        a[:] = src
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+def _partition(a, low, high, before_or_equal):
+    pivot = a[high]
+    i = low - 1
+    for j in range(low, high):
+        if before_or_equal(a[j], pivot):
+            i += 1
+            a[i], a[j] = a[j], a[i]
+    a[i + 1], a[high] = a[high], a[i + 1]
+    return i + 1
+
+
+def _quicksort(a, reverse, progress_callback, randomized):
+    before_or_equal = operator.ge if reverse else operator.le
+    n = len(a)
+    every = _progress_every(n)
+    placed = 0
+    stack = [(0, n - 1)]
+    while stack:
+        low, high = stack.pop()
+        if low < high:
+            if randomized:
+                r = random.randint(low, high)
+                a[r], a[high] = a[high], a[r]
+            pi = _partition(a, low, high, before_or_equal)
+            stack.append((low, pi - 1))
+            stack.append((pi + 1, high))
+            placed += 1
+            if progress_callback and placed % every == 0:
+                progress_callback(min(0.99, placed / n))
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+def quicksort(a, reverse=False, progress_callback=None, stats=None):
+    """Unstable iterative quicksort (last-element pivot)."""
+    return _quicksort(a, reverse, progress_callback, randomized=False)
+
+
+def random_quicksort(a, reverse=False, progress_callback=None, stats=None):
+    """Unstable iterative quicksort with a random pivot."""
+    return _quicksort(a, reverse, progress_callback, randomized=True)
+
+
+def _heapify_range(a, lo, hi, after):
+    """Build a heap over ``a[lo:hi]`` whose root sorts last."""
+    for start in range(lo + (hi - lo) // 2 - 1, lo - 1, -1):
+        _sift_down(a, lo, start, hi, after)
+
+
+def _sift_down(a, lo, pos, hi, after):
+    """Bottom-up sift-down of ``a[pos]`` in the heap ``a[lo:hi]``.
+
+    Walks the hole down to a leaf along the larger children (one comparison
+    per level) and then climbs back up to place the item, which needs fewer
+    comparisons than the textbook sift-down on average.
+    """
+    item = a[pos]
+    start = pos
+    child = lo + 2 * (pos - lo) + 1
+    while child < hi:
+        right = child + 1
+        if right < hi and after(a[right], a[child]):
+            child = right
+        a[pos] = a[child]
+        pos = child
+        child = lo + 2 * (pos - lo) + 1
+    while pos > start:
+        parent = lo + (pos - lo - 1) // 2
+        if not after(item, a[parent]):
+            break
+        a[pos] = a[parent]
+        pos = parent
+    a[pos] = item
+
+
+def _heapsort_range(a, lo, hi, after, progress_callback=None):
+    _heapify_range(a, lo, hi, after)
+    n = hi - lo
+    every = _progress_every(n)
+    for end in range(hi - 1, lo, -1):
+        a[lo], a[end] = a[end], a[lo]
+        _sift_down(a, lo, lo, end, after)
+        if progress_callback and (hi - end) % every == 0:
+            progress_callback((hi - end) / n)
+
+
+def heapsort(a, reverse=False, progress_callback=None, stats=None):
+    """Unstable in-place heapsort, O(n log n) worst case."""
+    after = operator.lt if reverse else operator.gt
+    _heapsort_range(a, 0, len(a), after, progress_callback)
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+# Partitions at or below this size are left for the final insertion sort pass
+INTRO_THRESHOLD = 16
+
+
+def _median_of_three_to_front(a, lo, hi, before):
+    """Move the median of a[lo], a[mid], a[hi - 1] to a[lo]."""
+    mid = (lo + hi) // 2
+    x, y, z = lo, mid, hi - 1
+    if before(a[y], a[x]):
+        x, y = y, x
+    if before(a[z], a[y]):
+        y, z = z, y
+        if before(a[y], a[x]):
+            x, y = y, x
+    a[lo], a[y] = a[y], a[lo]
+
+
+def _hoare_partition(a, lo, hi, before):
+    """Partition ``a[lo:hi]`` around the pivot at ``a[lo]``; returns the split index.
+
+    Elements equal to the pivot stop both scans, so runs of equal keys split
+    evenly instead of degrading to quadratic time.
+    """
+    pivot = a[lo]
+    i, j = lo - 1, hi
+    while True:
+        i += 1
+        while before(a[i], pivot):
+            i += 1
+        j -= 1
+        while before(pivot, a[j]):
+            j -= 1
+        if i >= j:
+            return j
+        a[i], a[j] = a[j], a[i]
+
+
+def introsort(a, reverse=False, progress_callback=None, stats=None):
+    """Unstable in-place introsort, O(n log n) worst case.
+
+    Median-of-three quicksort that switches a partition to heapsort once
+    its depth exceeds 2*log2(n), leaving small partitions for one final
+    insertion sort pass.
+    """
+    before = operator.gt if reverse else operator.lt
+    after = operator.lt if reverse else operator.gt
+    n = len(a)
+    if n < 2:
+        if progress_callback:
+            progress_callback(1.0)
+        return a
+    every = _progress_every(n)
+    done = 0
+    stack = [(0, n, 2 * n.bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= INTRO_THRESHOLD:
+            done += hi - lo
+        elif depth == 0:
+            _heapsort_range(a, lo, hi, after)
+            done += hi - lo
+        else:
+            _median_of_three_to_front(a, lo, hi, before)
+            p = _hoare_partition(a, lo, hi, before)
+            stack.append((lo, p + 1, depth - 1))
+            stack.append((p + 1, hi, depth - 1))
+            continue
+        if progress_callback and done % every < INTRO_THRESHOLD:
+            progress_callback(min(0.99, done / n))
+    insertion_sort(a, reverse)
+    if progress_callback:
+        progress_callback(1.0)
+    return a
+
+
+# ---------------------- Distribution engines ----------------------
+
+# Ceiling for counting sort's auxiliary structures (count array, hash table,
+# radix buckets); override per call with ``max_memory`` or via the
+# SORTLAB_COUNTING_MEMORY environment variable (bytes).
+COUNTING_MEMORY_LIMIT = int(os.environ.get('SORTLAB_COUNTING_MEMORY', 256 * 1024 * 1024))
+# A dense count array is used while the key range is at most this many slots per element
+DENSE_SLOTS_PER_ITEM = 4
+_DICT_ENTRY_SIZE = 100   # rough bytes per dict entry including the int key/count
+_LIST_SIZE = sys.getsizeof([])
+
+
+def choose_counting_strategy(keys, lo, hi, max_memory=None, n=None):
+    """Pick ``'dense'``, ``'sparse'`` or ``'radix'`` for integer ``keys`` in ``[lo, hi]``.
+
+    Returns ``(strategy, estimated_aux_bytes)``.  Dense counting is used when
+    the range is small relative to n; otherwise a sample of the keys decides
+    between a hash-table count (many repeats) and an LSD radix sort (mostly
+    distinct keys, e.g. 7-digit IDs or 64-bit values).  Raises
+    ``MemoryError`` if no strategy fits under ``max_memory``.  Pass ``n``
+    when ``keys`` is itself only a sample of the data.
+    """
+    limit = COUNTING_MEMORY_LIMIT if max_memory is None else max_memory
+    n = len(keys) if n is None else n
+    span = hi - lo + 1
+    dense = span * POINTER_SIZE
+    if span <= DENSE_SLOTS_PER_ITEM * n + 1024 and dense <= limit:
+        return 'dense', dense
+    step = max(1, len(keys) // 1024)
+    sample = keys[::step]
+    distinct = max(1, int(len(set(sample)) / len(sample) * n))
+    sparse = distinct * (_DICT_ENTRY_SIZE + POINTER_SIZE)
+    digit_bits = _radix_digit_bits(span, n)
+    radix = 2 * n * POINTER_SIZE + (1 << digit_bits) * _LIST_SIZE
+    options = [('sparse', sparse), ('radix', radix)]
+    if distinct > n // 4:
+        options.reverse()
+    options.append(('dense', dense))
+    for strategy, size in options:
+        if size <= limit:
+            return strategy, size
+    raise MemoryError(f"Counting Sort needs at least {min(sparse, radix, dense):,} bytes of "
+                      f"auxiliary memory for {n:,} keys spanning {span:,} values "
+                      f"(limit {limit:,}); raise max_memory or use a comparison sort")
+
+
+def _radix_digit_bits(span, n):
+    """Digit width giving the fewest passes over ``span`` for ``n`` keys.
+
+    Each pass walks ``2 ** width`` buckets, so the width is capped near
+    ``log2(n)`` (between 8 and 16 bits): a few keys spread over 64 bits
+    then take several cheap passes instead of four passes of 65,536 buckets.
+    """
+    bits = max(1, (span - 1).bit_length())
+    width = min(16, max(8, n.bit_length()))
+    passes = -(-bits // width)
+    return -(-bits // passes)
+
+
+def _radix_order(keys, lo, hi, reverse, progress_callback=None):
+    """Stable LSD radix sort of positions ``0..n-1`` by ``keys[i] - lo``."""
+    n = len(keys)
+    order = list(range(n))
+    bits = (hi - lo).bit_length()
+    if not bits:
+        return order
+    digit_bits = _radix_digit_bits(hi - lo + 1, n)
+    mask = (1 << digit_bits) - 1
+    passes = -(-bits // digit_bits)
+    for p in range(passes):
+        shift = p * digit_bits
+        buckets = [[] for _ in range(mask + 1)]
+        for i in order:
+            buckets[((keys[i] - lo) >> shift) & mask].append(i)
+        if reverse:
+            buckets.reverse()
+        order = [i for bucket in buckets for i in bucket]
+        if progress_callback:
+            progress_callback(min(0.99, (p + 1) / passes))
+    return order
+
+
+def counting_sort(a, reverse=False, key=None, progress_callback=None, stats=None,
+                  max_memory=None):
+    """Stable, range-adaptive counting sort over integer keys; returns a new list.
+
+    Depending on the measured key range and repetition (see
+    ``choose_counting_strategy``) it counts into a dense array, a hash
+    table, or falls back to an LSD radix sort, keeping the auxiliary memory
+    under ``max_memory``.  Descending order is produced directly by laying
+    out slots from the largest key down, so no post-reversal is needed.
+    """
+    n = len(a)
+    out = [None] * n
+    _count_copy(stats, n)
+    if not n:
+        if progress_callback:
+            progress_callback(1.0)
+        return out
+    if key is None:
+        keys = a
+    else:
+        keys = [key(x) for x in a]
+        _count_copy(stats, n)
+    lo, hi = min(keys), max(keys)
+    if not (isinstance(lo, int) and isinstance(hi, int)):
+        raise TypeError("Counting Sort needs integer keys")
+    strategy, aux = choose_counting_strategy(keys, lo, hi, max_memory)
+    if stats is not None:
+        stats['strategy'] = strategy
+        stats['copies'] += 1
+        stats['bytes_copied'] += aux
+
+    every = _progress_every(n)
+    if strategy == 'radix':
+        for idx, i in enumerate(_radix_order(keys, lo, hi, reverse, progress_callback)):
+            out[idx] = a[i]
+    else:
+        if strategy == 'dense':
+            count = [0] * (hi - lo + 1)
+            for k in keys:
+                count[k - lo] += 1
+            slots = range(len(count) - 1, -1, -1) if reverse else range(len(count))
+            offset = lo
+        else:
+            count = {}
+            for k in keys:
+                count[k] = count.get(k, 0) + 1
+            slots = sorted(count, reverse=reverse)
+            offset = 0
+        total = 0
+        for s in slots:
+            c = count[s]
+            count[s] = total
+            total += c
+        for idx, (k, x) in enumerate(zip(keys, a)):
+            pos = count[k - offset]
+            out[pos] = x
+            count[k - offset] = pos + 1
+            if progress_callback and idx % every == 0:
+                progress_callback(idx / n)
+    if progress_callback:
+        progress_callback(1.0)
+    return out
+
+
+# ---------------------- Engine registry ----------------------
+
+ENGINES = {
+    'Bubble Sort': bubble_sort,
+    'Selection Sort': selection_sort,
+    'Insertion Sort': insertion_sort,
+    'Merge Sort': merge_sort,
+    'Quicksort': quicksort,
+    'Random Quicksort': random_quicksort,
+    'Heapsort': heapsort,
+    'Introsort': introsort,
+    'Counting Sort': counting_sort,
+}
+
+STABLE_ENGINES = {'Bubble Sort', 'Insertion Sort', 'Merge Sort', 'Counting Sort'}
+
+# Engines that take ``key`` themselves and build their own output list.
+DISTRIBUTION_ENGINES = {'Counting Sort'}
+
+
+def sort(data, algorithm='Merge Sort', key=None, reverse=False, inplace=False,
+         stable=False, progress_callback=None, max_memory=None):
+    """Sort ``data`` with the named engine and return ``(result, stats)``.
+
+    With ``inplace=True`` the list ``data`` itself is reordered and returned;
+    otherwise ``data`` is left untouched and exactly one copy of it is made.
+    ``key`` is evaluated once per element.  Passing ``key`` (or
+    ``stable=True``) makes unstable engines stable by tagging each element
+    with its original position.
+
+    ``stats`` holds the elapsed ``time`` plus the number of element arrays
+    allocated (``copies``) and their approximate size (``bytes_copied``).
+    ``max_memory`` caps the auxiliary memory of distribution engines; their
+    chosen ``strategy`` is added to ``stats``.
+    """
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    engine = ENGINES[algorithm]
+    n = len(data)
+    stats = _new_stats(algorithm, n)
+    start = time.perf_counter()
+
+    if algorithm in DISTRIBUTION_ENGINES:
+        out = engine(data, reverse=reverse, key=key, progress_callback=progress_callback,
+                     stats=stats, max_memory=max_memory)
+        if inplace:
+            data[:] = out
+            out = data
+    elif key is None and (not stable or algorithm in STABLE_ENGINES):
+        if inplace:
+            out = data
+        else:
+            out = list(data)
+            _count_copy(stats, n)
+        engine(out, reverse=reverse, progress_callback=progress_callback, stats=stats)
+    else:
+        # Decorate with (key, position, item).  The position keeps equal keys
+        # in input order (negated for descending) and means items themselves
+        # are never compared.
+        if key is None:
+            decorated = [(x, -i if reverse else i, x) for i, x in enumerate(data)]
+        else:
+            decorated = [(key(x), -i if reverse else i, x) for i, x in enumerate(data)]
+        _count_copy(stats, n, _DECORATED_SIZE)
+        engine(decorated, reverse=reverse, progress_callback=progress_callback, stats=stats)
+        if inplace:
+            for i, t in enumerate(decorated):
+                data[i] = t[2]
+            out = data
+        else:
+            out = [t[2] for t in decorated]
+            _count_copy(stats, n)
+
+    stats['time'] = time.perf_counter() - start
+    return out, stats
+
+
+def format_bytes(n):
+    """Human readable byte count, e.g. ``1.5 MB``."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
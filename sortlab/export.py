@@ -0,0 +1,151 @@
+"""Streaming export of sorted output.
+
+``Exporter`` encodes batches on the calling thread and hands the bytes to
+a background writer thread through a bounded queue, so encoding overlaps
+with compression and disk I/O (zlib and file writes release the GIL).
+Formats, picked from the file name unless given explicitly:
+
+- ``csv``:  rows (dicts) or plain values, written with ``writerows``.
+- ``ints``: newline-delimited integers (``.txt``, same as ``dataset.txt``).
+- ``bin``:  ``SLB1`` magic followed by little-endian int64 values.
+
+A trailing ``.gz`` adds gzip compression.
+"""
+import array
+import csv
+import gzip
+import io
+import os
+import queue
+import sys
+import threading
+import time
+
+BATCH = 50000
+BIN_MAGIC = b'SLB1'
+FORMATS = ('csv', 'ints', 'bin')
+
+
+def detect_format(path):
+    """``(fmt, compress)`` from a file name such as ``out.csv.gz``."""
+    name = path.lower()
+    compress = name.endswith('.gz')
+    if compress:
+        name = name[:-3]
+    if name.endswith('.csv'):
+        return 'csv', compress
+    if name.endswith('.bin'):
+        return 'bin', compress
+    return 'ints', compress
+
+
+class Exporter:
+    """Write sorted output in batches on a background writer thread."""
+
+    def __init__(self, path, fmt=None, compress=None, fieldnames=None,
+                 queue_size=8, compresslevel=6):
+        guessed_fmt, guessed_compress = detect_format(path)
+        self.path = path
+        self.fmt = fmt or guessed_fmt
+        if self.fmt not in FORMATS:
+            raise ValueError(f"export format must be one of {FORMATS}")
+        self.compress = guessed_compress if compress is None else compress
+        self.fieldnames = fieldnames
+        self.rows = 0
+        self.raw_bytes = 0
+        self._error = None
+        self._queue = queue.Queue(queue_size)
+        if self.compress:
+            self._file = gzip.open(path, 'wb', compresslevel=compresslevel)
+        else:
+            self._file = open(path, 'wb', buffering=1024 * 1024)
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+        if self.fmt == 'bin':
+            self._put(BIN_MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _drain(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is None:
+                try:
+                    self._file.write(chunk)
+                except Exception as e:
+                    self._error = e
+
+    def _put(self, chunk):
+        if self._error is not None:
+            raise self._error
+        self.raw_bytes += len(chunk)
+        self._queue.put(chunk)
+
+    def _encode(self, batch):
+        if self.fmt == 'bin':
+            values = array.array('q', batch)
+            if sys.byteorder != 'little':
+                values.byteswap()
+            return values.tobytes()
+        if self.fmt == 'ints':
+            return ('\n'.join(map(str, batch)) + '\n').encode('utf-8')
+        buf = io.StringIO()
+        if isinstance(batch[0], dict):
+            if self.fieldnames is None:
+                self.fieldnames = list(batch[0])
+                csv.writer(buf).writerow(self.fieldnames)
+            csv.DictWriter(buf, fieldnames=self.fieldnames).writerows(batch)
+        else:
+            csv.writer(buf).writerows([v] for v in batch)
+        return buf.getvalue().encode('utf-8')
+
+    def write(self, items):
+        """Encode ``items`` in ``BATCH``-sized pieces and queue them for writing."""
+        for i in range(0, len(items), BATCH):
+            batch = items[i:i + BATCH]
+            self._put(self._encode(batch))
+            self.rows += len(batch)
+
+    def close(self):
+        """Flush, close and return the write ``stats`` dict."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+        if self._error is not None:
+            raise self._error
+        elapsed = time.perf_counter() - self._start
+        self.stats = {
+            'path': self.path, 'format': self.fmt, 'compressed': self.compress,
+            'rows': self.rows, 'raw_bytes': self.raw_bytes,
+            'file_bytes': os.path.getsize(self.path), 'time': elapsed,
+            'mb_per_s': self.raw_bytes / 1e6 / elapsed if elapsed else 0.0,
+        }
+        return self.stats
+
+
+def export(items, path, fmt=None, compress=None, fieldnames=None):
+    """Write ``items`` to ``path`` in one go; returns the write stats."""
+    with Exporter(path, fmt=fmt, compress=compress, fieldnames=fieldnames) as ex:
+        ex.write(items)
+    return ex.stats
+
+
+def read_binary(path):
+    """Read back a ``bin`` export as a list of ints."""
+    opener = gzip.open if path.lower().endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        if f.read(len(BIN_MAGIC)) != BIN_MAGIC:
+            raise ValueError(f"{path} is not a sortlab binary export")
+        values = array.array('q')
+        values.frombytes(f.read())
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tolist()
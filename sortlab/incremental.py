@@ -0,0 +1,149 @@
+"""Incremental re-sort for append-only CSV files.
+
+The sorted order of a CSV's rows (their row numbers, as ``array('q')``) is
+saved in a sidecar file (see ``sidecar``) together with the byte offset it
+covers and a CRC of the bytes before that offset.  The next run re-parses
+the covered rows in file order and puts them in the saved order without
+sorting, parses only the bytes appended since, sorts that delta with the
+chosen engine and merges it in: O(n + d log d) instead of a full
+O(n log n) sort.
+"""
+import array
+import csv
+import io
+import time
+
+from . import encoding, engine, loaders, sidecar
+
+STATE_VERSION = 3
+
+
+def state_path(csv_path, column, reverse=False):
+    order = 'desc' if reverse else 'asc'
+    return f"{csv_path}.{column}-{order}.sortstate"
+
+
+def _parse_tail(csv_path, offset, fieldnames, end=None):
+    """Rows of the complete lines from ``offset`` (to ``end`` or EOF); returns ``(rows, new_offset)``.
+
+    A trailing line without a newline is treated as an append still in
+    progress and left for the next run.
+    """
+    with open(csv_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read() if end is None else f.read(end - offset)
+    stop = data.rfind(b'\n') + 1
+    text = data[:stop].decode('utf-8')
+    rows = list(csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames))
+    return rows, offset + stop
+
+
+def _load_state(path, csv_path, column, reverse, fieldnames, data_start):
+    """``(offset, rows, order)`` of a saved state still describing a prefix of ``csv_path``.
+
+    ``rows`` are the covered rows in file order and ``order`` their sorted
+    row numbers; returns ``None`` when there is no usable state.
+    """
+    saved = sidecar.load(path)
+    if saved is None:
+        return None
+    state, arrays = saved
+    order = arrays.get('order')
+    if (state.get('version') != STATE_VERSION or state.get('column') != column
+            or state.get('reverse') != reverse or state.get('header') != fieldnames
+            or order is None or not isinstance(state.get('offset'), int)
+            or not sidecar.prefix_matches(csv_path, state['offset'], state.get('fingerprint'))):
+        return None
+    rows, offset = _parse_tail(csv_path, data_start, fieldnames, state['offset'])
+    # the order must be a permutation of the covered rows
+    n = len(rows)
+    if offset != state['offset'] or len(order) != n or (
+            n and (min(order) < 0 or max(order) >= n or len(set(order)) != n)):
+        return None
+    return offset, rows, order
+
+
+def merge_sorted(keys_a, rows_a, keys_b, rows_b, reverse=False):
+    """Linear stable merge of two sorted runs; ties keep run ``a`` first."""
+    keys, rows = [], []
+    i = j = 0
+    na, nb = len(keys_a), len(keys_b)
+    while i < na and j < nb:
+        if (keys_b[j] > keys_a[i]) if reverse else (keys_b[j] < keys_a[i]):
+            keys.append(keys_b[j])
+            rows.append(rows_b[j])
+            j += 1
+        else:
+            keys.append(keys_a[i])
+            rows.append(rows_a[i])
+            i += 1
+    keys.extend(keys_a[i:])
+    rows.extend(rows_a[i:])
+    keys.extend(keys_b[j:])
+    rows.extend(rows_b[j:])
+    return keys, rows
+
+
+def sort_incremental(csv_path, column, algorithm='Merge Sort', reverse=False,
+                     progress_callback=None, state_file=None):
+    """Sort all rows of ``csv_path`` by ``column``, reusing the saved state.
+
+    Returns ``(rows, info)``; ``info`` has the previous and delta row counts,
+    whether the saved state was reused and a ``timings`` dict with the
+    ``state_load`` (including re-parsing the covered rows), ``parse``,
+    ``sort``, ``merge`` and ``state_save`` phases.
+    """
+    if loaders.detect_compression(csv_path):
+        raise ValueError("Incremental mode needs an uncompressed CSV (byte offsets of a "
+                         "compressed file do not survive appends).")
+    state_file = state_file or state_path(csv_path, column, reverse)
+    timings = {}
+    fieldnames, data_start = loaders.read_header(csv_path)
+
+    start = time.perf_counter()
+    state = _load_state(state_file, csv_path, column, reverse, fieldnames, data_start)
+    timings['state_load'] = time.perf_counter() - start
+    reused = state is not None
+    offset, covered, order = state if reused else (data_start, [], array.array('q'))
+
+    start = time.perf_counter()
+    delta, offset = _parse_tail(csv_path, offset, fieldnames)
+    timings['parse'] = time.perf_counter() - start
+
+    # The delta sorts by its own dictionary codes (same order as the string
+    # key, and usable by Counting Sort); the merge compares the string keys,
+    # which stay comparable across runs.  Row numbers are sorted, not rows,
+    # so the new order can be saved.
+    sort_key, _ = encoding.column_key(delta, column)
+    codes = [sort_key(r) for r in delta]
+    delta_order, stats = engine.sort(list(range(len(delta))), algorithm, key=codes.__getitem__,
+                                     reverse=reverse, inplace=True,
+                                     progress_callback=progress_callback)
+    timings['sort'] = stats['time']
+
+    start = time.perf_counter()
+    key_fn = loaders.column_key(column)
+    previous = len(covered)
+    rows_all = covered + delta
+    delta_keys = [key_fn(delta[i]) for i in delta_order]
+    delta_order = [previous + i for i in delta_order]
+    if previous:
+        keys = [key_fn(covered[i]) for i in order]
+        _, merged = merge_sorted(keys, order, delta_keys, delta_order, reverse)
+    else:
+        merged = delta_order
+    rows = [rows_all[i] for i in merged]
+    timings['merge'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if delta or not reused:
+        with open(csv_path, 'rb') as f:
+            crc = sidecar.fingerprint(f, offset)
+        sidecar.save(state_file, {'version': STATE_VERSION, 'column': column, 'reverse': reverse,
+                                  'header': fieldnames, 'offset': offset, 'fingerprint': crc},
+                     {'order': array.array('q', merged)})
+    timings['state_save'] = time.perf_counter() - start
+
+    info = {'previous': previous, 'delta': len(delta), 'total': len(rows),
+            'reused': reused, 'timings': timings}
+    return rows, info
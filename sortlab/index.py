@@ -0,0 +1,196 @@
+"""Index-only sorting: sort (key, byte offset) pairs, read rows on demand.
+
+``build_index`` scans a CSV once, keeping only each row's byte offset
+(``array('q')``, 8 bytes per row) and a compact integer key (parsed IDs,
+or order-preserving codes for name columns, see ``encoding``).  Key and
+row number are packed into one int, so the engines sort plain ints and
+equal keys keep file order.  The resulting permutation of offsets is
+saved next to the CSV as a ``sidecar`` file (``<csv>.<column>-asc.sortidx``)
+and reused while the CSV still starts with the bytes it was built from.
+
+``SortIndex`` fetches rows with ``seek`` only when they are asked for,
+e.g. the ten rows on screen or the rows being exported.
+"""
+import array
+import csv
+import os
+import time
+
+from . import engine, loaders, sidecar
+
+INDEX_VERSION = 3
+ROW_BITS = 32
+ROW_MASK = (1 << ROW_BITS) - 1
+# Every CHECKPOINT-th row offset is kept so a prefix of N rows can be located
+CHECKPOINT = 1024
+
+
+def index_path(csv_path, column, reverse=False):
+    order = 'desc' if reverse else 'asc'
+    return f"{csv_path}.{column}-{order}.sortidx"
+
+
+def _split(line):
+    line = line.rstrip(b'\r\n')
+    if b'"' in line:
+        return [v.encode('utf-8') for v in next(csv.reader([line.decode('utf-8')]))]
+    return line.split(b',')
+
+
+def _scan(csv_path, column, n_rows=None, progress_callback=None):
+    """``(offsets, keys, end, complete)`` for the first ``n_rows`` rows."""
+    fieldnames, pos = loaders.read_header(csv_path)
+    col = fieldnames.index(column)
+    offsets = array.array('q')
+    keys = array.array('q')
+    names = {}  # raw name bytes -> first-seen id, turned into ordered codes below
+    with open(csv_path, 'rb') as f:
+        f.seek(pos)
+        complete = True
+        for line in f:
+            if n_rows is not None and len(offsets) >= n_rows:
+                complete = False
+                break
+            fields = _split(line)
+            value = fields[col] if col < len(fields) else b''
+            if column == 'ID':
+                keys.append(int(value) if value.strip() else 0)
+            else:
+                keys.append(names.setdefault(value, len(names)))
+            offsets.append(pos)
+            pos += len(line)
+            if progress_callback and len(offsets) % 100000 == 0:
+                progress_callback(None)
+    if names:
+        # same order as loaders.column_key: case-insensitive names
+        folded = {raw: raw.decode('utf-8').lower() for raw in names}
+        rank = {v: i for i, v in enumerate(sorted(set(folded.values())))}
+        code = [0] * len(names)
+        for raw, first_id in names.items():
+            code[first_id] = rank[folded[raw]]
+        keys = array.array('q', (code[k] for k in keys))
+    return offsets, keys, pos, complete
+
+
+def _load(path, csv_path, column, reverse):
+    """Saved state if it still describes a prefix of ``csv_path``, else ``None``."""
+    saved = sidecar.load(path)
+    if saved is None:
+        return None
+    state, arrays = saved
+    order, checkpoints = arrays.get('order'), arrays.get('checkpoints')
+    if (state.get('version') != INDEX_VERSION or state.get('column') != column
+            or state.get('reverse') != reverse or order is None or checkpoints is None
+            or len(order) != state.get('n') or not isinstance(state.get('end'), int)
+            or not sidecar.prefix_matches(csv_path, state['end'], state.get('fingerprint'))):
+        return None
+    state.update(order=order, checkpoints=checkpoints)
+    if state.get('complete') and os.path.getsize(csv_path) != state['end']:
+        state['complete'] = False  # rows were appended since
+    return state
+
+
+def _prefix_end(csv_path, state, n_rows):
+    """Byte offset where row ``n_rows`` starts, from the saved checkpoints."""
+    start = state['checkpoints'][n_rows // CHECKPOINT]
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        for _ in range(n_rows % CHECKPOINT):
+            f.readline()
+        return f.tell()
+
+
+class SortIndex:
+    """Rows of a CSV in sorted order, read from disk only when accessed."""
+
+    def __init__(self, csv_path, order):
+        self.csv_path = csv_path
+        self.order = order
+        self.fieldnames, _ = loaders.read_header(csv_path)
+        self._file = open(csv_path, 'rb')
+
+    def __len__(self):
+        return len(self.order)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def _read(self, offset):
+        self._file.seek(offset)
+        values = next(csv.reader([self._file.readline().decode('utf-8')]))
+        return dict(zip(self.fieldnames, values))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._read(o) for o in self.order[i]]
+        return self._read(self.order[i])
+
+    def nbytes(self):
+        return self.order.itemsize * len(self.order)
+
+
+def build_index(csv_path, column, algorithm='Merge Sort', reverse=False, n_rows=None,
+                progress_callback=None, index_file=None):
+    """Scan, sort and save the index; returns ``(SortIndex, info)``."""
+    if loaders.detect_compression(csv_path):
+        raise ValueError("Index mode needs an uncompressed CSV (rows are read back by byte offset).")
+    info = {'reused': False}
+    start = time.perf_counter()
+    offsets, keys, end, complete = _scan(csv_path, column, n_rows, progress_callback)
+    info['scan'] = time.perf_counter() - start
+
+    # key and row number packed into one int; reversed row numbers for
+    # descending order keep equal keys in file order
+    if reverse:
+        packed = [(k << ROW_BITS) | (ROW_MASK - i) for i, k in enumerate(keys)]
+    else:
+        packed = [(k << ROW_BITS) | i for i, k in enumerate(keys)]
+    del keys
+    packed, stats = engine.sort(packed, algorithm, reverse=reverse, inplace=True,
+                                progress_callback=progress_callback)
+    if reverse:
+        order = array.array('q', (offsets[ROW_MASK - (p & ROW_MASK)] for p in packed))
+    else:
+        order = array.array('q', (offsets[p & ROW_MASK] for p in packed))
+    info['sort'] = time.perf_counter() - start - info['scan']
+    info['strategy'] = stats.get('strategy')
+
+    start = time.perf_counter()
+    with open(csv_path, 'rb') as f:
+        fingerprint = sidecar.fingerprint(f, end)
+    sidecar.save(index_file or index_path(csv_path, column, reverse), {
+        'version': INDEX_VERSION, 'column': column, 'reverse': reverse, 'algorithm': algorithm,
+        'n': len(order), 'end': end, 'complete': complete, 'fingerprint': fingerprint,
+    }, {'order': order, 'checkpoints': offsets[::CHECKPOINT]})
+    info['save'] = time.perf_counter() - start
+    return SortIndex(csv_path, order), info
+
+
+def sorted_index(csv_path, column, algorithm='Merge Sort', reverse=False, n_rows=None,
+                 progress_callback=None, index_file=None):
+    """The sorted index of the first ``n_rows`` rows, from the saved index when possible.
+
+    A saved index covering at least ``n_rows`` rows is reused (for fewer
+    rows its offsets are filtered to the prefix); otherwise a new index is
+    built and saved.  Returns ``(SortIndex, info)``; ``info['reused']``
+    tells which happened.
+    """
+    index_file = index_file or index_path(csv_path, column, reverse)
+    start = time.perf_counter()
+    state = None if loaders.detect_compression(csv_path) else _load(index_file, csv_path,
+                                                                     column, reverse)
+    if state is not None:
+        covered = state['complete'] or (n_rows is not None and n_rows <= state['n'])
+        if covered:
+            order = state['order']
+            if n_rows is not None and n_rows < state['n']:
+                cutoff = _prefix_end(csv_path, state, n_rows)
+                order = array.array('q', (o for o in order if o < cutoff))
+            return SortIndex(csv_path, order), {'reused': True, 'load': time.perf_counter() - start}
+    return build_index(csv_path, column, algorithm, reverse, n_rows, progress_callback, index_file)
@@ -0,0 +1,288 @@
+"""Online order statistics over a stream of integers.
+
+``OrderStatistics`` is a blocked sorted list: the values live in sorted
+blocks of ``LOAD`` to ``2 * LOAD`` items, with each block's maximum kept in
+``maxes`` and the block sizes in a Fenwick tree.  An insert bisects
+``maxes`` to find its block and ``insort``s into it, so it costs
+``O(log n)`` comparisons plus a memmove of at most ``2 * LOAD`` pointers.
+``rank`` and ``select`` walk the Fenwick tree instead of re-sorting, and
+``top`` reads the first or last blocks only.
+
+Splitting a full block changes the block numbering, so the tree is then
+rebuilt lazily (``O(n / LOAD)``) by the next rank or select query.
+
+Run on a ``dataset.txt``-style stream (one integer per line)::
+
+    python -m sortlab.orderstat PRELIM-LAB-WORK-2/dataset.txt --percentiles 50 95 99 --top 10
+    tail -f feed.txt | python -m sortlab.orderstat - --every 5
+    python -m sortlab.orderstat feed.txt --follow --rank 5000
+"""
+import argparse
+import bisect
+import math
+import sys
+import time
+
+from . import loaders
+from .timing import timed
+
+LOAD = 1000
+POLL_SECONDS = 0.5
+
+
+class OrderStatistics:
+    """Sorted multiset of values with ``O(log n)`` insert, rank and select."""
+
+    def __init__(self, values=()):
+        self._blocks = []
+        self._maxes = []
+        self._tree = None  # Fenwick tree over block sizes; None until rebuilt
+        self._len = 0
+        self.update(values)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def add(self, value):
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([value])
+            maxes.append(value)
+            self._tree = None
+            self._len = 1
+            return
+        i = bisect.bisect_right(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            blocks[i].append(value)
+            maxes[i] = value
+        else:
+            bisect.insort_right(blocks[i], value)
+        self._len += 1
+        block = blocks[i]
+        if len(block) > 2 * LOAD:
+            blocks.insert(i + 1, block[LOAD:])
+            del block[LOAD:]
+            maxes.insert(i, block[-1])
+            self._tree = None
+        elif self._tree is not None:
+            tree, j = self._tree, i + 1
+            while j < len(tree):
+                tree[j] += 1
+                j += j & -j
+
+    def update(self, values):
+        """Add many values; into an empty structure they are sorted once and blocked."""
+        if self._len:
+            for value in values:
+                self.add(value)
+            return
+        values = sorted(values)
+        self._blocks = [values[i:i + LOAD] for i in range(0, len(values), LOAD)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._tree = None
+        self._len = len(values)
+
+    def _index(self):
+        if self._tree is None:
+            tree = [0] + [len(block) for block in self._blocks]
+            for i in range(1, len(tree)):
+                j = i + (i & -i)
+                if j < len(tree):
+                    tree[j] += tree[i]
+            self._tree = tree
+        return self._tree
+
+    def _prefix(self, blocks):
+        """Number of values in the first ``blocks`` blocks."""
+        tree, total = self._index(), 0
+        while blocks:
+            total += tree[blocks]
+            blocks -= blocks & -blocks
+        return total
+
+    def rank(self, value):
+        """Number of values strictly less than ``value``."""
+        i = bisect.bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+        return self._prefix(i) + bisect.bisect_left(self._blocks[i], value)
+
+    def count(self, value):
+        """Number of values equal to ``value``."""
+        i = bisect.bisect_left(self._maxes, value)
+        total = 0
+        while i < len(self._blocks):
+            block = self._blocks[i]
+            total += bisect.bisect_right(block, value) - bisect.bisect_left(block, value)
+            if block[-1] != value:
+                break
+            i += 1
+        return total
+
+    def select(self, k):
+        """The ``k``-th smallest value (0-based; negative counts from the largest)."""
+        if k < 0:
+            k += self._len
+        if not 0 <= k < self._len:
+            raise IndexError("select index out of range")
+        tree = self._index()
+        pos, step = 0, 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return self._blocks[pos][k]
+
+    def percentile(self, p):
+        """Nearest-rank percentile: the smallest value with at least ``p``% of values <= it."""
+        if not self._len:
+            raise IndexError("percentile of an empty stream")
+        if not 0 <= p <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        return self.select(max(0, math.ceil(p / 100 * self._len) - 1))
+
+    def top(self, k, largest=True):
+        """The ``k`` largest values, largest first (or smallest first with ``largest=False``)."""
+        result = []
+        blocks = reversed(self._blocks) if largest else self._blocks
+        for block in blocks:
+            if len(result) >= k:
+                break
+            result.extend(reversed(block) if largest else block)
+        return result[:k]
+
+    def nbytes(self):
+        """Estimated bytes held by the block lists (pointers only, not the ints)."""
+        return 8 * (self._len + len(self._blocks) + len(self._maxes))
+
+
+# ---------------------- Streaming ----------------------
+
+def follow_lines(f):
+    """Yield complete lines from ``f`` and keep going as it grows, like ``tail -f``.
+
+    Yields ``None`` at end of file; the caller waits (e.g. ``POLL_SECONDS``)
+    before asking for more, so idle time can be kept out of the ingest rate.
+    """
+    partial = ''
+    while True:
+        line = f.readline()
+        if not line:
+            yield None
+            continue
+        partial += line
+        if partial.endswith('\n'):
+            yield partial
+            partial = ''
+
+
+def iter_values(lines):
+    """Integers from ``dataset.txt``-style lines; ``None`` (idle) is passed through."""
+    for line in lines:
+        if line is None:
+            yield None
+            continue
+        line = line.strip()
+        if line:
+            yield int(line)
+
+
+class QueryLatency:
+    """Count, mean and worst latency per query type."""
+
+    def __init__(self):
+        self.stats = {}  # name -> [count, total s, max s]
+
+    def run(self, name, func, *args):
+        result, seconds = timed(func, *args)
+        entry = self.stats.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        return result
+
+    def summary(self):
+        return ' | '.join(f"{name} {total / count * 1e6:.1f} us avg, {worst * 1e6:.1f} us max"
+                          for name, (count, total, worst) in self.stats.items())
+
+
+def report(stats, ingest_seconds, latency, percentiles=(50, 95, 99), top=10, ranks=(), selects=()):
+    """Run the queries against ``stats`` and format them with the ingest rate."""
+    n = len(stats)
+    rate = n / ingest_seconds if ingest_seconds else 0.0
+    lines = [f"{n:,} values, ingest {rate:,.0f} values/s ({ingest_seconds:.3f} s)"]
+    if n:
+        parts = [f"p{p:g}={latency.run('percentile', stats.percentile, p)}" for p in percentiles]
+        parts += [f"rank({x})={latency.run('rank', stats.rank, x)}" for x in ranks]
+        parts += [f"select({k})={latency.run('select', stats.select, k)}" for k in selects
+                  if -n <= k < n]
+        if parts:
+            lines.append('  '.join(parts))
+        if top:
+            lines.append(f"top {top}: {latency.run('top', stats.top, top)}")
+        lines.append(f"query latency: {latency.summary()}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sortlab.orderstat',
+                                     description="Streaming rank/percentile/top-K over integers")
+    parser.add_argument('path', help="one-integer-per-line file, or '-' for stdin")
+    parser.add_argument('--follow', action='store_true',
+                        help='keep reading as the file grows (like tail -f)')
+    parser.add_argument('--every', type=float, default=5.0,
+                        help='seconds between reports while streaming (0: only at the end)')
+    parser.add_argument('--percentiles', type=float, nargs='*', default=[50, 95, 99])
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--rank', type=int, nargs='*', default=[], help='count values below these')
+    parser.add_argument('--select', type=int, nargs='*', default=[], help='k-th smallest (0-based)')
+    args = parser.parse_args(argv)
+
+    if args.path == '-':
+        f = sys.stdin
+    elif args.follow:
+        if loaders.detect_compression(args.path):
+            parser.error("--follow needs an uncompressed file")
+        f = open(args.path, 'r', encoding='utf-8')
+    else:
+        f = loaders.open_dataset(args.path)
+    lines = follow_lines(f) if args.follow else f
+
+    stats = OrderStatistics()
+    latency = QueryLatency()
+    queries = dict(percentiles=args.percentiles, top=args.top, ranks=args.rank, selects=args.select)
+    ingest = 0.0
+    last_report = time.perf_counter()
+    try:
+        start = time.perf_counter()
+        for value in iter_values(lines):
+            if value is not None:
+                stats.add(value)
+                if len(stats) & 1023:
+                    continue
+            now = time.perf_counter()
+            ingest += now - start
+            if args.every and now - last_report >= args.every:
+                print(report(stats, ingest, latency, **queries), flush=True)
+                last_report = time.perf_counter()
+            if value is None:
+                time.sleep(POLL_SECONDS)
+            start = time.perf_counter()
+        ingest += time.perf_counter() - start
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    print(report(stats, ingest, latency, **queries))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""Pipelined load-and-sort: overlap CSV parsing with sorting.
+
+A producer thread parses the CSV into fixed-size batches and puts them on
+a bounded queue; each batch is sorted with the chosen engine as soon as it
+arrives; once the file is exhausted the sorted runs are combined with one
+stable k-way merge.  The bounded queue keeps at most ``queue_size``
+unsorted batches in memory when sorting falls behind.
+
+With ``sorters=1`` one sorter thread shares the GIL with the parser, so
+the two interleave rather than run in parallel: the gain is limited to
+I/O and decompression waits.  ``sorters > 1`` sorts batches in that many
+worker processes (rows are pickled there and back, the column name is
+sent rather than a key function), which only pays off with spare cores.
+
+Each batch sorts by codes of its own order-preserving dictionary (see
+``encoding``), so Counting Sort works on name columns; the merge compares
+the equivalent ``.lower()`` strings, since codes differ between batches.
+
+With ``out_path`` the merge output is streamed straight into an
+``export.Exporter`` instead of being collected, so writing overlaps with
+merging and the sorted rows are never held as one list.
+"""
+import csv
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+from . import encoding, engine, export, loaders, pools
+
+BATCH_ROWS = 50000
+QUEUE_BATCHES = 4
+# Rows kept in info['head'] when the output is streamed to a file
+HEAD_ROWS = 10
+_DONE = object()
+
+
+def iter_batches(path, batch_rows=BATCH_ROWS, n_rows=None):
+    """Yield lists of up to ``batch_rows`` CSV rows (dicts), ``n_rows`` in total."""
+    with loaders.open_dataset(path, newline='') as f:
+        batch = []
+        for i, r in enumerate(csv.DictReader(f)):
+            if n_rows is not None and i >= n_rows:
+                break
+            batch.append(r)
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _sort_batch(batch, algorithm, column, reverse):
+    """Sort one batch by ``column``; runs in a sorter thread or a pool process."""
+    key, _ = encoding.column_key(batch, column)
+    return engine.sort(batch, algorithm, key=key, reverse=reverse, inplace=True)
+
+
+def pipeline_sort(path, algorithm='Merge Sort', column='ID', n_rows=None, reverse=False,
+                  batch_rows=BATCH_ROWS, sorters=1, queue_size=QUEUE_BATCHES,
+                  progress_callback=None, out_path=None):
+    """Load and sort ``path`` by ``column`` with loading and sorting overlapped.
+
+    Returns ``(rows, info)``.  ``info`` has the number of ``batches`` and
+    ``rows``, the producer's ``load`` time and time ``blocked`` on a full
+    queue, the summed batch ``sort`` time, the ``merge`` time, the wall
+    ``total`` and ``overlap``: seconds during which loading and sorting
+    were both under way.  ``sorters > 1`` sorts in that many processes.
+
+    With ``out_path`` the merged rows are written to that file (any
+    ``export`` format) as they come out of the merge and ``rows`` is
+    ``None``; ``info`` then also has the first ``HEAD_ROWS`` rows as
+    ``head`` and the write stats as ``write``, and ``merge`` includes the
+    writing.
+    """
+    key = loaders.column_key(column)
+    pool = None
+    if sorters > 1:
+        # fork every worker now, before the producer and sorter threads start
+        pool = pools.process_pool(sorters, warm=True)
+    batches = queue.Queue(queue_size)
+    runs = {}
+    lock = threading.Lock()
+    info = {'batches': 0, 'rows': 0, 'load': 0.0, 'blocked': 0.0, 'sort': 0.0}
+    errors = []
+    first_sort = []
+    start = time.perf_counter()
+
+    def produce():
+        try:
+            for i, batch in enumerate(iter_batches(path, batch_rows, n_rows)):
+                put_start = time.perf_counter()
+                batches.put((i, batch))
+                info['blocked'] += time.perf_counter() - put_start
+                info['batches'] += 1
+                info['rows'] += len(batch)
+                if progress_callback:
+                    progress_callback(info['rows'] / n_rows if n_rows else None)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            info['load'] = time.perf_counter() - start - info['blocked']
+            info['load_end'] = time.perf_counter()
+            for _ in range(sorters):
+                batches.put(_DONE)
+
+    def consume():
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                return
+            i, batch = item
+            with lock:
+                if not first_sort:
+                    first_sort.append(time.perf_counter())
+            try:
+                if pool:
+                    # the thread only waits here; the sort runs in a pool process
+                    run, stats = pool.submit(_sort_batch, batch, algorithm, column, reverse).result()
+                else:
+                    run, stats = _sort_batch(batch, algorithm, column, reverse)
+            except Exception as e:
+                errors.append(e)
+                continue
+            with lock:
+                runs[i] = run
+                info['sort'] += stats['time']
+
+    threads = [threading.Thread(target=produce, daemon=True)]
+    threads += [threading.Thread(target=consume, daemon=True) for _ in range(sorters)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        if pool:
+            pool.shutdown()
+    if errors:
+        raise errors[0]
+
+    merge_start = time.perf_counter()
+    ordered = [runs[i] for i in sorted(runs)]
+    if len(ordered) == 1:
+        merged = ordered[0]
+    else:
+        # heapq.merge is stable across runs, and runs are in file order
+        merged = heapq.merge(*ordered, key=key, reverse=reverse)
+    if out_path:
+        rows = None
+        merged = iter(merged)
+        writer = export.Exporter(out_path)
+        try:
+            batch = list(itertools.islice(merged, export.BATCH))
+            info['head'] = batch[:HEAD_ROWS]
+            while batch:
+                writer.write(batch)
+                batch = list(itertools.islice(merged, export.BATCH))
+        finally:
+            info['write'] = writer.close()
+    else:
+        rows = merged if isinstance(merged, list) else list(merged)
+    end = time.perf_counter()
+    info['merge'] = end - merge_start
+    info['total'] = end - start
+    info['overlap'] = max(0.0, info['load_end'] - first_sort[0]) if first_sort else 0.0
+    del info['load_end']
+    if progress_callback:
+        progress_callback(1.0)
+    return rows, info
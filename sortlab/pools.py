@@ -0,0 +1,28 @@
+"""Process pools for the parallel loader, the pipeline sorters and the service.
+
+``concurrent.futures.process`` pulls in ``multiprocessing``, so it is only
+imported once a pool is actually wanted; single-process runs never pay
+for it.  ``warm=True`` starts every worker before returning.  A worker
+forked later copies the parent as it is at that moment, including
+threads' locks and open sockets, so callers that go on to start threads
+or accept connections warm their pool first.
+"""
+import os
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def process_pool(workers, warm=False):
+    """A ``ProcessPoolExecutor`` with ``workers`` processes, all started if ``warm``."""
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=workers)
+    if warm:
+        try:
+            for fut in [pool.submit(_warm_up) for _ in range(workers)]:
+                fut.result()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+    return pool
@@ -0,0 +1,197 @@
+"""Runtime and memory prediction for a sort before it starts.
+
+Each engine has a work model in terms of n and the *disorder* of the data
+(the fraction of key pairs that are out of the requested order, estimated
+from random pairs of a sample).  A short calibration run of the engine on
+a sample of the real data, with the real key function, turns work units
+into seconds on this machine, after taking out the per-row cost of
+evaluating the key and decorating the rows.  Both constants are kept per
+(engine, key type).
+
+Memory is predicted as the auxiliary bytes ``engine.sort`` reports in
+``bytes_copied``, so predictions and results are directly comparable.
+``record`` appends one JSON line per run (``SORTLAB_PREDICT_LOG``, default
+``./predictions.jsonl``) and ``summarize`` reports the error per engine.
+"""
+import json
+import math
+import os
+import random
+import statistics
+import time
+
+from . import engine
+
+QUADRATIC = {'Bubble Sort', 'Selection Sort', 'Insertion Sort'}
+# Rows sorted by the calibration run: big enough to dwarf per-call overhead,
+# small enough to stay well under 100 ms even for the quadratic engines.
+CALIBRATION_ROWS = {'quadratic': 400, 'nlogn': 4000, 'linear': 20000}
+DISORDER_PAIRS = 2000
+# Last-element-pivot quicksort degrades to n^2/2 on (nearly) ordered input
+DEGENERATE_DISORDER = 0.02
+
+
+def default_log():
+    return os.environ.get('SORTLAB_PREDICT_LOG') or os.path.join(os.getcwd(), 'predictions.jsonl')
+
+
+def _family(algorithm):
+    if algorithm in QUADRATIC:
+        return 'quadratic'
+    if algorithm in engine.DISTRIBUTION_ENGINES:
+        return 'linear'
+    return 'nlogn'
+
+
+def key_type(sample, key=None):
+    """``'plain'`` without a key, else the key's type name (``'int'``, ``'str'``...)."""
+    if key is None:
+        return 'plain'
+    return type(key(sample[0])).__name__ if sample else 'int'
+
+
+def disorder(sample, key=None, reverse=False, pairs=DISORDER_PAIRS, seed=0):
+    """Estimated fraction of pairs out of order (0 sorted, ~0.5 random, 1 reversed)."""
+    n = len(sample)
+    if n < 2:
+        return 0.0
+    # only the drawn pairs are keyed, so cost does not grow with the sample
+    value = sample.__getitem__ if key is None else (lambda i: key(sample[i]))
+    rng = random.Random(seed)
+    inverted = 0
+    for _ in range(pairs):
+        i, j = sorted(rng.sample(range(n), 2))
+        a, b = value(i), value(j)
+        if (a < b) if reverse else (a > b):
+            inverted += 1
+    return inverted / pairs
+
+
+def work(algorithm, n, dis=0.5):
+    """Work units of one run: the engine's complexity model at disorder ``dis``."""
+    if n < 2:
+        return 1.0
+    half_square = n * n / 2
+    if algorithm == 'Bubble Sort':
+        # early exit: passes shrink as the data approaches sorted order
+        return n + half_square * min(1.0, 2 * dis)
+    if algorithm == 'Selection Sort':
+        return half_square
+    if algorithm == 'Insertion Sort':
+        # one shift per inversion
+        return n + dis * half_square
+    if algorithm in engine.DISTRIBUTION_ENGINES:
+        return float(n)
+    nlogn = n * math.log2(n)
+    if algorithm == 'Quicksort':
+        degenerate = max(0.0, 1 - min(dis, 1 - dis) / DEGENERATE_DISORDER)
+        return nlogn + degenerate * half_square
+    return nlogn
+
+
+def predict_memory(algorithm, n, key=None, stable=False, inplace=True, sample=None):
+    """Predicted ``bytes_copied`` of ``engine.sort`` for ``n`` items."""
+    ptr = engine.POINTER_SIZE
+    if algorithm in engine.DISTRIBUTION_ENGINES:
+        total = n * ptr + (n * ptr if key is not None else 0)
+        keys = sample if key is None or not sample else [key(x) for x in sample]
+        if keys and isinstance(keys[0], int):
+            total += engine.choose_counting_strategy(keys, min(keys), max(keys), n=n)[1]
+        return total
+    total = 0 if inplace else n * ptr
+    if key is not None or (stable and algorithm not in engine.STABLE_ENGINES):
+        total += n * engine._DECORATED_SIZE
+    if algorithm == 'Merge Sort':
+        total += n * ptr
+    return total
+
+
+class RuntimePredictor:
+    """Calibrates per (engine, key type) and predicts time and memory of a run."""
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path or default_log()
+        self.constants = {}  # (algorithm, key type) -> (s per work unit, s per row)
+
+    def calibrate(self, algorithm, sample, key=None, reverse=False, seed=0, kind=None):
+        """Time the engine on part of ``sample``; returns ``(s per work unit, s per row)``.
+
+        ``kind`` labels the key type when its result type is ambiguous
+        (e.g. dictionary codes and parsed IDs are both ints).
+        """
+        size = min(len(sample), CALIBRATION_ROWS[_family(algorithm)])
+        if size < 2:
+            raise ValueError("need at least two rows to calibrate")
+        part = random.Random(seed).sample(sample, size)
+        dis = disorder(part, key, reverse)
+        best = per_row = float('inf')
+        for _ in range(2):
+            start = time.perf_counter()
+            if key is None:
+                list(part)
+            elif algorithm in engine.DISTRIBUTION_ENGINES:
+                [key(x) for x in part]
+            else:
+                [(key(x), i, x) for i, x in enumerate(part)]
+            per_row = min(per_row, (time.perf_counter() - start) / size)
+            _, stats = engine.sort(part, algorithm, key=key, reverse=reverse)
+            best = min(best, stats['time'])
+        per_unit = max(0.0, best - per_row * size) / work(algorithm, size, dis)
+        self.constants[(algorithm, kind or key_type(sample, key))] = per_unit, per_row
+        return per_unit, per_row
+
+    def predict(self, sample, algorithm, n=None, key=None, reverse=False, inplace=True, kind=None):
+        """Predict a run over ``n`` rows (default ``len(sample)``) like ``sample``.
+
+        Calibrates on first use for this engine and key type.  Returns a
+        dict with ``time`` (s), ``memory`` (bytes), ``disorder``, ``work``
+        and the inputs, ready for ``record``.
+        """
+        n = len(sample) if n is None else n
+        ktype = kind or key_type(sample, key)
+        calibrated = (algorithm, ktype) not in self.constants
+        if calibrated:
+            self.calibrate(algorithm, sample, key, reverse, kind=ktype)
+        dis = disorder(sample, key, reverse)
+        units = work(algorithm, n, dis)
+        per_unit, per_row = self.constants[(algorithm, ktype)]
+        return {
+            'algorithm': algorithm, 'n': n, 'key_type': ktype, 'reverse': reverse,
+            'disorder': round(dis, 4), 'work': units, 'calibrated': calibrated,
+            'time': units * per_unit + n * per_row,
+            'memory': predict_memory(algorithm, n, key, inplace=inplace, sample=sample),
+        }
+
+    def record(self, prediction, stats):
+        """Append prediction vs ``engine.sort`` stats to the log; returns the entry."""
+        entry = dict(prediction, actual_n=stats['n'], actual_time=stats['time'],
+                     actual_memory=stats['bytes_copied'],
+                     timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        entry['time_ratio'] = entry['actual_time'] / entry['time'] if entry['time'] else None
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError:
+            pass  # logging must never fail a run
+        return entry
+
+
+def format_eta(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    if seconds < 120:
+        return f"{seconds:.1f} s"
+    return f"{seconds / 60:.1f} min"
+
+
+def summarize(log_path=None):
+    """Per-engine accuracy from the log: runs, median and worst actual/predicted ratio."""
+    ratios = {}
+    with open(log_path or default_log(), encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get('time_ratio'):
+                ratios.setdefault(entry['algorithm'], []).append(entry['time_ratio'])
+    return {alg: {'runs': len(r), 'median': statistics.median(r),
+                  'worst': max(r, key=lambda x: max(x, 1 / x))}
+            for alg, r in ratios.items()}
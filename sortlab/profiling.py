@@ -0,0 +1,203 @@
+"""Per-run profiling hooks with flame-graph export.
+
+``profiled(func, ...)`` runs one call under either ``cProfile`` or a
+low-overhead stack sampler thread and writes two files per run:
+
+- ``<name>.pstats``: loadable with ``pstats.Stats`` / snakeviz.
+- ``<name>.collapsed``: one ``frame;frame;frame weight`` line per stack,
+  ready for ``flamegraph.pl`` or speedscope.
+
+The mode is chosen per call, falling back to the ``SORTLAB_PROFILE``
+environment variable (``off``, ``cprofile`` or ``sample``).
+"""
+import collections
+import cProfile
+import marshal
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+MODES = ('off', 'cprofile', 'sample')
+DEFAULT_INTERVAL = 0.002
+
+
+def default_mode():
+    mode = os.environ.get('SORTLAB_PROFILE', 'off').lower()
+    return mode if mode in MODES else 'off'
+
+
+def default_dir():
+    return os.environ.get('SORTLAB_PROFILE_DIR') or os.path.join(os.getcwd(), 'profiles')
+
+
+def _label(func):
+    """Flame-graph frame name for a pstats ``(file, line, name)`` key."""
+    filename, line, name = func
+    if filename == '~':
+        text = name
+    else:
+        text = f"{name} ({os.path.basename(filename)}:{line})"
+    return text.replace(';', ',')
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds."""
+
+    def __init__(self, thread_id, interval=DEFAULT_INTERVAL, root_code=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_code = root_code
+        self.samples = collections.Counter()
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._start
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code is self.root_code:
+                    break
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+    def to_pstats(self):
+        """Approximate pstats dict: self/inclusive time from sample counts."""
+        total = sum(self.samples.values())
+        per_sample = self.elapsed / total if total else self.interval
+        stats = {}
+        callers = collections.defaultdict(collections.Counter)
+        own = collections.Counter()
+        inclusive = collections.Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for func in set(stack):
+                inclusive[func] += count
+            for caller, callee in zip(stack, stack[1:]):
+                callers[callee][caller] += count
+        for func, count in inclusive.items():
+            edges = {c: (n, n, 0.0, n * per_sample) for c, n in callers[func].items()}
+            stats[func] = (count, count, own[func] * per_sample, count * per_sample, edges)
+        return stats
+
+    def collapsed(self):
+        return {';'.join(_label(f) for f in stack): count for stack, count in self.samples.items()}
+
+
+def collapse_pstats(stats, min_seconds=1e-6, max_depth=128):
+    """Rebuild collapsed stacks (in microseconds) from a cProfile stats dict.
+
+    cProfile keeps only caller/callee edges, so each function's self time is
+    spread over its call paths in proportion to the cumulative time of each
+    incoming edge.  Recursive edges are folded into the first occurrence.
+    """
+    callees = collections.defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+    lines = collections.Counter()
+
+    def walk(func, path, frac):
+        _, _, tt, ct, _ = stats[func]
+        path = path + (func,)
+        if tt * frac >= min_seconds:
+            lines[path] += tt * frac
+        if len(path) >= max_depth:
+            return
+        for callee, edge in callees[func].items():
+            callee_ct = stats[callee][3]
+            if callee in path or callee_ct <= 0:
+                continue
+            share = frac * edge[3] / callee_ct
+            if share * callee_ct >= min_seconds:
+                walk(callee, path, share)
+
+    for func, entry in stats.items():
+        if not entry[4]:
+            walk(func, (), 1.0)
+    return {';'.join(_label(f) for f in path): int(round(sec * 1e6))
+            for path, sec in lines.items() if sec * 1e6 >= 1}
+
+
+def top_functions(pstats_path, n=15):
+    """The ``n`` functions with the most self time, as dicts for display."""
+    st = pstats.Stats(pstats_path).stats
+    ranked = sorted(st.items(), key=lambda kv: kv[1][2], reverse=True)[:n]
+    return [{'function': _label(func), 'calls': nc, 'self': tt, 'cumulative': ct}
+            for func, (_, nc, tt, ct, _) in ranked]
+
+
+def profiled(func, *args, mode=None, name='run', out_dir=None, top_n=15,
+             interval=DEFAULT_INTERVAL, **kwargs):
+    """Call ``func(*args, **kwargs)`` under a profiler; returns ``(result, report)``.
+
+    ``report`` is ``None`` when profiling is off, else a dict with the
+    ``mode``, the ``pstats`` and ``collapsed`` file paths and a ``top`` list.
+    Exceptions from ``func`` propagate after the profile files are written.
+    """
+    mode = (mode or default_mode()).lower()
+    if mode not in MODES:
+        raise ValueError(f"profile mode must be one of {MODES}")
+    if mode == 'off':
+        return func(*args, **kwargs), None
+
+    out_dir = out_dir or default_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+    base = os.path.join(out_dir, f"{safe}-{time.strftime('%Y%m%d-%H%M%S')}-{mode}")
+    report = {'mode': mode, 'pstats': base + '.pstats', 'collapsed': base + '.collapsed'}
+
+    if mode == 'cprofile':
+        prof = cProfile.Profile()
+        try:
+            result = prof.runcall(func, *args, **kwargs)
+        finally:
+            prof.create_stats()
+            prof.dump_stats(report['pstats'])
+            collapsed = collapse_pstats(prof.stats)
+    else:
+        sampler = StackSampler(threading.get_ident(), interval, root_code=profiled.__code__)
+        sampler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            with open(report['pstats'], 'wb') as f:
+                marshal.dump(sampler.to_pstats(), f)
+            collapsed = sampler.collapsed()
+            report['samples'] = sum(sampler.samples.values())
+
+    with open(report['collapsed'], 'w', encoding='utf-8') as f:
+        for stack, weight in sorted(collapsed.items()):
+            f.write(f"{stack} {weight}\n")
+    report['top'] = top_functions(report['pstats'], top_n)
+    return result, report
+
+
+def format_top(report):
+    """Plain-text table of ``report['top']`` for text widgets and the CLI."""
+    calls = 'samples' if report['mode'] == 'sample' else 'calls'
+    lines = [f"🔥 Hot functions ({report['mode']}, self time)",
+             f"{'self s':>9} {'cum s':>9} {calls:>10}  function"]
+    for row in report['top']:
+        lines.append(f"{row['self']:>9.4f} {row['cumulative']:>9.4f} {row['calls']:>10,}  {row['function']}")
+    lines.append(f"pstats: {report['pstats']}")
+    lines.append(f"collapsed: {report['collapsed']}")
+    return '\n'.join(lines)
@@ -0,0 +1,383 @@
+"""Local sort-as-a-service daemon.
+
+A small asyncio HTTP/JSON server that queues sort/benchmark jobs and runs
+them on a bounded process pool using the shared engines.  Start it with::
+
+    python -m sortlab.service --port 8765 --workers 2
+
+Endpoints (all JSON, one request per connection):
+
+    GET    /health            queue and worker counts
+    POST   /jobs              submit a job, 202 with its id (503 when the queue is full)
+    GET    /jobs              summary of every job
+    GET    /jobs/<id>         status, result and timings of one job
+    GET    /jobs/<id>/events  newline-delimited JSON progress events, streamed until the job ends
+    DELETE /jobs/<id>         cancel a queued or running job
+
+Finished jobs are kept for ``--job-ttl`` seconds, and only the most
+recent ``--max-finished`` of them, so a long-running daemon does not grow
+without bound; an evicted id answers 404.
+
+``path`` may be a plain or gzip/bz2/xz-compressed ``.csv`` or integer
+dataset.  A job body looks like ``{"path": "data/generated_data.csv", "algorithm":
+"Merge Sort", "column": "ID", "n": 10000, "top_k": 10, "reverse": false}``;
+``"data": [...]`` (ints, or row dicts with ``column``) replaces ``path``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from . import encoding, engine, loaders, pools
+
+MAX_BODY = 64 * 1024 * 1024
+FINISHED = ('done', 'failed', 'cancelled')
+JOB_TTL = 3600.0
+MAX_FINISHED = 1000
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+# ---------------------- Worker side (runs in the process pool) ----------------------
+
+def run_job(job_id, spec, events, cancelled):
+    """Load, sort and summarize one job; returns a JSON-ready dict."""
+    last = [None, -1]
+
+    def emit(phase, pct):
+        if cancelled.get(job_id):
+            raise JobCancelled()
+        # only forward whole-percent changes to keep the event stream small
+        step = -1 if pct is None else int(pct * 100)
+        if (phase, step) != tuple(last):
+            last[:] = [phase, step]
+            events.put((job_id, {'event': 'progress', 'phase': phase, 'pct': pct}))
+
+    emit('load', None)
+    load_timings = {}
+    start = time.perf_counter()
+    if 'data' in spec:
+        data = list(spec['data'])
+        if spec.get('n') is not None:
+            del data[spec['n']:]
+    elif loaders.is_csv(spec['path']):
+        data, _ = loaders.load_csv(spec['path'], n_rows=spec.get('n'),
+                                   progress_callback=lambda pct: emit('load', pct),
+                                   timings=load_timings)
+    else:
+        data = loaders.read_dataset(spec['path'], timings=load_timings)
+        if spec.get('n') is not None:
+            del data[spec['n']:]
+    load_time = time.perf_counter() - start
+
+    key = None
+    if data and isinstance(data[0], dict):
+        key, _ = encoding.column_key(data, spec.get('column', 'ID'))
+    emit('sort', 0.0)
+    result, stats = engine.sort(data, spec.get('algorithm', 'Merge Sort'), key=key,
+                                reverse=bool(spec.get('reverse')), inplace=True,
+                                progress_callback=lambda pct: emit('sort', pct))
+    return {
+        'n': len(result),
+        'top': result[:spec.get('top_k', 10)],
+        'timings': {'load': load_time, 'sort': stats['time'],
+                    'decompress': load_timings.get('decompress', 0.0),
+                    'parse': load_timings.get('parse', load_time)},
+        'copies': stats['copies'],
+        'bytes_copied': stats['bytes_copied'],
+    }
+
+
+def validate(spec):
+    """Return a cleaned job spec or raise ``ValueError``."""
+    if not isinstance(spec, dict):
+        raise ValueError("job must be a JSON object")
+    if ('path' in spec) == ('data' in spec):
+        raise ValueError("give exactly one of 'path' or 'data'")
+    if 'path' in spec and not os.path.isfile(spec['path']):
+        raise ValueError(f"no such file: {spec['path']}")
+    if 'data' in spec and not isinstance(spec['data'], list):
+        raise ValueError("'data' must be a list")
+    if spec.get('algorithm', 'Merge Sort') not in engine.ENGINES:
+        raise ValueError(f"unknown algorithm; choose from {list(engine.ENGINES)}")
+    for field in ('n', 'top_k'):
+        if field in spec and (not isinstance(spec[field], int) or spec[field] < 0):
+            raise ValueError(f"'{field}' must be a non-negative integer")
+    return spec
+
+
+# ---------------------- Service (event loop side) ----------------------
+
+class SortService:
+    """Bounded job queue feeding ``max_running`` jobs at a time to a process pool."""
+
+    def __init__(self, workers=2, max_queue=16, max_running=None, job_ttl=JOB_TTL,
+                 max_finished=MAX_FINISHED):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_running = min(workers, max_running or workers)
+        self.job_ttl = job_ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._running = 0
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.max_queue)
+        # Start every pool process now: processes forked later, while serving,
+        # would inherit the open client and listening sockets and keep them
+        # open after the server closes its end.
+        self.pool = pools.process_pool(self.workers, warm=True)
+        self.manager = multiprocessing.Manager()
+        self.events = self.manager.Queue()
+        self.cancelled = self.manager.dict()
+        self._pump = threading.Thread(target=self._pump_events, daemon=True)
+        self._pump.start()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_running)]
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        self.events.put(None)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.manager.shutdown()
+
+    def submit(self, spec):
+        """Queue a validated job; raises ``QueueFull`` for backpressure."""
+        job = {'status': 'queued', 'spec': spec, 'submitted': time.time(), 'finished': None,
+               'result': None, 'error': None, 'timings': {}, 'events': [],
+               'changed': asyncio.Condition()}
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f"queue is full ({self.max_queue} jobs)") from None
+        # ids are only taken by accepted jobs, so rejected ones leave no gaps
+        job['id'] = str(next(self._ids))
+        self.jobs[job['id']] = job
+        self._add_event(job, {'event': 'status', 'status': 'queued'})
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs[job_id]
+        if job['status'] == 'queued':
+            self._finish(job, 'cancelled')
+        elif job['status'] == 'running':
+            # the worker notices on its next progress callback
+            self.cancelled[job_id] = True
+        return job
+
+    async def _dispatch(self):
+        while True:
+            job = await self.queue.get()
+            job_id = job['id']
+            if job['status'] != 'queued':
+                continue
+            job['status'] = 'running'
+            job['timings']['queued'] = time.time() - job['submitted']
+            self._add_event(job, {'event': 'status', 'status': 'running'})
+            self._running += 1
+            start = time.perf_counter()
+            try:
+                result = await self.loop.run_in_executor(
+                    self.pool, run_job, job_id, job['spec'], self.events, self.cancelled)
+            except JobCancelled:
+                self._finish(job, 'cancelled')
+            except Exception as e:
+                job['error'] = str(e) or type(e).__name__
+                self._finish(job, 'failed')
+            else:
+                job['result'] = result
+                job['timings'].update(result.pop('timings'))
+                job['timings']['total'] = time.perf_counter() - start
+                self._finish(job, 'done')
+            finally:
+                self._running -= 1
+                self.cancelled.pop(job_id, None)
+
+    def _pump_events(self):
+        # Blocking reads from the manager queue happen here, off the event loop
+        while True:
+            item = self.events.get()
+            if item is None:
+                return
+            job_id, event = item
+            self.loop.call_soon_threadsafe(self._on_worker_event, job_id, event)
+
+    def _on_worker_event(self, job_id, event):
+        job = self.jobs.get(job_id)
+        if job and job['status'] == 'running':
+            self._add_event(job, event)
+
+    def _finish(self, job, status):
+        job['status'] = status
+        job['finished'] = time.time()
+        self._add_event(job, {'event': 'status', 'status': status, 'error': job['error']})
+        self._evict()
+
+    def _evict(self):
+        """Forget finished jobs past ``job_ttl``, then the oldest beyond ``max_finished``."""
+        finished = sorted((j for j in self.jobs.values() if j['status'] in FINISHED),
+                          key=lambda j: j['finished'])
+        cutoff = time.time() - self.job_ttl
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i >= excess and job['finished'] >= cutoff:
+                break
+            del self.jobs[job['id']]
+
+    def _add_event(self, job, event):
+        job['events'].append(event)
+
+        async def notify():
+            async with job['changed']:
+                job['changed'].notify_all()
+        self.loop.create_task(notify())
+
+    def health(self):
+        return {'queued': self.queue.qsize(), 'running': self._running,
+                'workers': self.workers, 'max_running': self.max_running,
+                'max_queue': self.max_queue}
+
+    @staticmethod
+    def describe(job, full=True):
+        out = {k: job[k] for k in ('id', 'status', 'error', 'timings')}
+        out['algorithm'] = job['spec'].get('algorithm', 'Merge Sort')
+        if full:
+            out['result'] = job['result']
+        return out
+
+    # ---------------------- HTTP ----------------------
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY:
+                await self._send(writer, 413, {'error': 'request body too large'})
+                return
+            body = await reader.readexactly(length) if length else b''
+            await self._route(method.upper(), urlsplit(target).path.rstrip('/'), body, writer)
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._send(writer, 400, {'error': 'malformed request'})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body, writer):
+        parts = path.strip('/').split('/')
+        if method == 'GET' and path == '/health':
+            await self._send(writer, 200, self.health())
+        elif parts[0] != 'jobs':
+            await self._send(writer, 404, {'error': 'not found'})
+        elif len(parts) == 1 and method == 'POST':
+            try:
+                spec = validate(json.loads(body or b'{}'))
+                job = self.submit(spec)
+            except QueueFull as e:
+                await self._send(writer, 503, {'error': str(e)}, {'Retry-After': '1'})
+            except ValueError as e:
+                await self._send(writer, 400, {'error': str(e)})
+            else:
+                await self._send(writer, 202, self.describe(job, full=False))
+        elif len(parts) == 1 and method == 'GET':
+            await self._send(writer, 200, [self.describe(j, full=False) for j in self.jobs.values()])
+        elif parts[1] not in self.jobs:
+            await self._send(writer, 404, {'error': 'no such job'})
+        elif len(parts) == 2 and method == 'GET':
+            await self._send(writer, 200, self.describe(self.jobs[parts[1]]))
+        elif len(parts) == 2 and method == 'DELETE':
+            await self._send(writer, 200, self.describe(self.cancel(parts[1]), full=False))
+        elif len(parts) == 3 and parts[2] == 'events' and method == 'GET':
+            await self._stream_events(self.jobs[parts[1]], writer)
+        else:
+            await self._send(writer, 405, {'error': 'method not allowed'})
+
+    async def _send(self, writer, status, obj, extra_headers=None):
+        payload = json.dumps(obj).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Content-Length': str(len(payload)),
+                   'Connection': 'close', **(extra_headers or {})}
+        writer.write(self._head(status, headers) + payload)
+        await writer.drain()
+
+    async def _stream_events(self, job, writer):
+        writer.write(self._head(200, {'Content-Type': 'application/x-ndjson',
+                                      'Transfer-Encoding': 'chunked', 'Connection': 'close'}))
+        sent = 0
+        while True:
+            async with job['changed']:
+                await job['changed'].wait_for(lambda: len(job['events']) > sent)
+            pending = job['events'][sent:]
+            sent += len(pending)
+            data = b''.join(json.dumps(e).encode('utf-8') + b'\n' for e in pending)
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+            await writer.drain()
+            if job['status'] in FINISHED and sent == len(job['events']):
+                break
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    @staticmethod
+    def _head(status, headers):
+        reasons = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+        lines = [f"HTTP/1.1 {status} {reasons.get(status, '')}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def serve(host='127.0.0.1', port=8765, workers=2, max_queue=16, max_running=None,
+                job_ttl=JOB_TTL, max_finished=MAX_FINISHED):
+    service = SortService(workers=workers, max_queue=max_queue, max_running=max_running,
+                          job_ttl=job_ttl, max_finished=max_finished)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"sortlab service on http://{host}:{port} ({workers} workers, queue {max_queue})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sortlab.service', description="Local sort-as-a-service daemon")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=max(1, min(4, os.cpu_count() or 1)))
+    parser.add_argument('--max-queue', type=int, default=16, help='queued jobs before new ones get 503')
+    parser.add_argument('--max-running', type=int, default=None, help='jobs run at once (<= workers)')
+    parser.add_argument('--job-ttl', type=float, default=JOB_TTL,
+                        help='seconds a finished job stays queryable')
+    parser.add_argument('--max-finished', type=int, default=MAX_FINISHED,
+                        help='finished jobs kept, oldest evicted first')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_queue, args.max_running,
+                          args.job_ttl, args.max_finished))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Timing helpers shared by the GUIs, the headless CLI and the benchmarks."""
+import time
+from contextlib import contextmanager
+
+
+def timed(func, *args, **kwargs):
+    """Call ``func(*args, **kwargs)``; returns ``(result, seconds)``."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase (``load``, ``sort``, ``write``...)."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self):
+        return sum(self.phases.values())
+
+    def summary(self):
+        """``Load: 0.1234 s | Sort: 0.5678 s | Total: 0.6912 s``"""
+        parts = [f"{name.capitalize()}: {t:.4f} s" for name, t in self.phases.items()]
+        parts.append(f"Total: {self.total():.4f} s")
+        return ' | '.join(parts)
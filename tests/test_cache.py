@@ -0,0 +1,101 @@
+"""Dataset cache: prefix reuse, LRU eviction and hit/miss accounting.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'PRELIM-EXAM', 'src'))
+
+from sortlab import cache, loaders, predict  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+class DatasetCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.csv = os.path.join(self.tmp, 'rows.csv')
+        with open(SAMPLE_CSV, 'rb') as src, open(self.csv, 'wb') as dst:
+            for _ in range(1001):
+                dst.write(src.readline())
+        self.rows, _ = loaders.load_csv(self.csv)
+
+    def test_prefixes_are_served_from_a_longer_load(self):
+        dc = cache.DatasetCache()
+        rows, _, hit = dc.load(self.csv, 600)
+        self.assertFalse(hit)
+        self.assertEqual(rows, self.rows[:600])
+        for n_rows in (1, 600):
+            rows, _, hit = dc.load(self.csv, n_rows)
+            self.assertTrue(hit)
+            self.assertEqual(rows, self.rows[:n_rows])
+        rows.reverse()  # callers sort the returned list in place
+        self.assertEqual(dc.load(self.csv, 600)[0], self.rows[:600])
+        self.assertFalse(dc.load(self.csv, 700)[2])
+        # a load that reached the end of the file covers any request
+        self.assertFalse(dc.load(self.csv, 5000)[2])
+        rows, _, hit = dc.load(self.csv, None)
+        self.assertTrue(hit)
+        self.assertEqual(rows, self.rows)
+        self.assertEqual((dc.hits, dc.misses), (4, 3))
+
+    def test_changed_file_is_reloaded(self):
+        dc = cache.DatasetCache()
+        dc.load(self.csv)
+        with open(self.csv, 'ab') as f:
+            f.write(b'1,Ana,Cruz\n')
+        rows, _, hit = dc.load(self.csv)
+        self.assertFalse(hit)
+        self.assertEqual(len(rows), len(self.rows) + 1)
+        self.assertEqual(len(dc), 1)
+
+    def test_least_recently_used_is_evicted(self):
+        other = os.path.join(self.tmp, 'other.csv')
+        shutil.copy(self.csv, other)
+        dc = cache.DatasetCache()
+        dc.load(self.csv)
+        dc.max_bytes = dc.resident_bytes() * 3 // 2
+        dc.load(other)
+        self.assertEqual(dc.evictions, 1)
+        self.assertIsNone(dc.peek(self.csv))
+        self.assertIsNotNone(dc.peek(other))
+
+    def test_peek_does_not_count_or_reorder(self):
+        dc = cache.DatasetCache()
+        self.assertIsNone(dc.peek(self.csv, 10))
+        dc.load(self.csv, 600)
+        self.assertEqual(dc.peek(self.csv, 400, limit=5), (400, self.rows[:5]))
+        self.assertEqual(dc.peek(self.csv, 600), (600, self.rows[:600]))
+        self.assertIsNone(dc.peek(self.csv, 601))
+        self.assertEqual((dc.hits, dc.misses), (0, 1))
+
+
+class BenchmarkAppCacheTest(unittest.TestCase):
+
+    def test_predict_then_run_counts_one_lookup(self):
+        import main
+        app = main.SortBenchmarkApp.__new__(main.SortBenchmarkApp)
+        app.msg_queue = queue.Queue()
+        app.dataset_cache = cache.DatasetCache()
+        app.predictor = predict.RuntimePredictor()
+        for run in range(2):
+            prediction = app._predict(SAMPLE_CSV, 2000, 'Merge Sort', 'LastName')
+            self.assertIsNotNone(prediction)
+            app._benchmark(SAMPLE_CSV, 2000, 'Merge Sort', 'LastName', 1, prediction)
+            self.assertEqual(app.dataset_cache.hits + app.dataset_cache.misses, run + 1)
+        self.assertEqual((app.dataset_cache.hits, app.dataset_cache.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Distributed sample sort on local workers, checked against a local stable sort.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sortlab import distributed, engine, export, loaders  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+class DistributedSortTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.csv = os.path.join(cls.tmp, 'rows.csv')
+        with open(SAMPLE_CSV, 'rb') as src, open(cls.csv, 'wb') as dst:
+            for _ in range(3001):
+                dst.write(src.readline())
+        cls.ints = os.path.join(cls.tmp, 'ints.txt')
+        rng = random.Random(0)
+        cls.values = [rng.randrange(-1000, 1000) for _ in range(5000)]
+        with open(cls.ints, 'w') as f:
+            f.writelines(f"{v}\n" for v in cls.values)
+        cls.procs, cls.addresses = distributed.spawn_local_workers(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        distributed.stop_workers(cls.addresses, cls.procs)
+        shutil.rmtree(cls.tmp)
+
+    def test_csv_columns_match_local_sort(self):
+        rows, _ = loaders.load_csv(self.csv)
+        for column in ('ID', 'LastName'):
+            for algorithm in ('Introsort', 'Counting Sort'):
+                for reverse in (False, True):
+                    with self.subTest(column=column, algorithm=algorithm, reverse=reverse):
+                        out, report = distributed.distributed_sort(
+                            self.csv, self.addresses, algorithm, column, reverse)
+                        expected, _ = engine.sort(rows, 'Merge Sort', reverse=reverse,
+                                                  key=loaders.column_key(column))
+                        self.assertEqual(out, expected)
+                        self.assertEqual(report['n'], len(rows))
+                        self.assertEqual(sum(node['n'] for node in report['nodes']), len(rows))
+
+    def test_ints_streamed_to_file(self):
+        out_path = os.path.join(self.tmp, 'sorted.bin')
+        rows, report = distributed.distributed_sort(self.ints, self.addresses, 'Heapsort',
+                                                    reverse=True, out_path=out_path)
+        self.assertIsNone(rows)
+        self.assertEqual(export.read_binary(out_path), sorted(self.values, reverse=True))
+        self.assertGreaterEqual(report['skew'], 1.0)
+
+    def test_worker_error_is_reported(self):
+        with self.assertRaises(RuntimeError):
+            distributed.distributed_sort(self.ints, self.addresses, 'No Such Sort')
+
+
+if __name__ == '__main__':
+    unittest.main()
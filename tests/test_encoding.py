@@ -0,0 +1,63 @@
+"""Dictionary codes must order names exactly like the ``.lower()`` string key.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sortlab import encoding, engine, loaders  # noqa: E402
+
+NAMES = ['Cruz', 'cruz', 'CRUZ', 'de la Cruz', 'Ángel', 'angel', 'Zoë', 'Ng', 'ng ', '', 'O\'Neil',
+         'van Dyke', 'Straße', 'STRASSE', 'İnan', 'a', 'B', 'b']
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = [{'ID': str(i), 'LastName': rng.choice(NAMES)} for i in range(n)]
+    rows[1]['LastName'] = None  # csv.DictReader fills short rows with None
+    del rows[2]['LastName']
+    return rows
+
+
+class ColumnDictionaryTest(unittest.TestCase):
+
+    def test_codes_order_like_lowercase(self):
+        dictionary = encoding.ColumnDictionary(NAMES)
+        for a, b in itertools.product(NAMES, repeat=2):
+            with self.subTest(a=a, b=b):
+                self.assertEqual(dictionary.codes[a] < dictionary.codes[b], a.lower() < b.lower())
+                self.assertEqual(dictionary.codes[a] == dictionary.codes[b], a.lower() == b.lower())
+        self.assertEqual(dictionary.decode(dictionary.codes['CRUZ']), 'cruz')
+        self.assertEqual(len(dictionary), len({v.lower() for v in NAMES}))
+
+    def test_custom_fold(self):
+        dictionary = encoding.ColumnDictionary(NAMES, fold=str)
+        self.assertEqual(sorted(NAMES, key=dictionary.codes.__getitem__), sorted(NAMES))
+
+    def test_engines_sort_like_the_string_key(self):
+        rows = make_rows(500)
+        key, dictionary = encoding.column_key(rows, 'LastName')
+        self.assertIsNotNone(dictionary)
+        for alg in engine.ENGINES:
+            for reverse in (False, True):
+                with self.subTest(alg=alg, reverse=reverse):
+                    out, _ = engine.sort(rows, alg, key=key, reverse=reverse)
+                    expected = sorted(rows, key=loaders.column_key('LastName'), reverse=reverse)
+                    self.assertEqual([r['ID'] for r in out], [r['ID'] for r in expected])
+
+    def test_id_is_not_encoded(self):
+        rows = make_rows(10)
+        key, dictionary = encoding.column_key(rows, 'ID')
+        self.assertIsNone(dictionary)
+        self.assertEqual([key(r) for r in rows], list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Checks of the ``engine.sort`` contract every GUI and tool relies on.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import functools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sortlab import engine  # noqa: E402
+
+
+@functools.total_ordering
+class Item:
+    """Orders by ``k`` only, so equal items can still be told apart by ``tag``."""
+
+    def __init__(self, k, tag):
+        self.k, self.tag = k, tag
+
+    def __eq__(self, other):
+        return self.k == other.k
+
+    def __lt__(self, other):
+        return self.k < other.k
+
+    def __repr__(self):
+        return f"Item({self.k}, {self.tag})"
+
+
+def ints(n, seed=0, spread=50):
+    rng = random.Random(seed)
+    return [rng.randrange(-spread, spread) for _ in range(n)]
+
+
+class EngineContractTest(unittest.TestCase):
+    N = 300
+
+    def test_matches_sorted(self):
+        data = ints(self.N)
+        for alg in engine.ENGINES:
+            for reverse in (False, True):
+                for inplace in (False, True):
+                    with self.subTest(alg=alg, reverse=reverse, inplace=inplace):
+                        work = list(data)
+                        out, stats = engine.sort(work, alg, reverse=reverse, inplace=inplace)
+                        self.assertEqual(out, sorted(data, reverse=reverse))
+                        self.assertEqual(stats['n'], self.N)
+                        if inplace:
+                            self.assertIs(out, work)
+                        else:
+                            self.assertIsNot(out, work)
+                            self.assertEqual(work, data)
+
+    def test_key_is_stable(self):
+        # few distinct keys, so equal keys must keep their input order
+        rows = [{'k': k, 'pos': i} for i, k in enumerate(ints(self.N, seed=1, spread=5))]
+        key = lambda r: r['k']  # noqa: E731
+        for alg in engine.ENGINES:
+            for reverse in (False, True):
+                for inplace in (False, True):
+                    with self.subTest(alg=alg, reverse=reverse, inplace=inplace):
+                        out, _ = engine.sort(list(rows), alg, key=key, reverse=reverse,
+                                             inplace=inplace)
+                        expected = sorted(rows, key=key, reverse=reverse)
+                        self.assertEqual([r['pos'] for r in out], [r['pos'] for r in expected])
+
+    def test_stable_flag_without_key(self):
+        items = [Item(k, i) for i, k in enumerate(ints(100, seed=2, spread=4))]
+        for alg in engine.ENGINES:
+            if alg in engine.DISTRIBUTION_ENGINES:
+                continue  # integer keys only
+            for reverse in (False, True):
+                with self.subTest(alg=alg, reverse=reverse):
+                    out, _ = engine.sort(items, alg, reverse=reverse, stable=True)
+                    expected = sorted(items, reverse=reverse)
+                    self.assertEqual([x.tag for x in out], [x.tag for x in expected])
+
+    def test_empty_and_single(self):
+        for alg in engine.ENGINES:
+            for data in ([], [7]):
+                with self.subTest(alg=alg, n=len(data)):
+                    seen = []
+                    out, stats = engine.sort(list(data), alg, progress_callback=seen.append)
+                    self.assertEqual(out, data)
+                    self.assertEqual(stats['n'], len(data))
+                    self.assertEqual(seen[-1], 1.0)
+
+    def test_copy_counts(self):
+        data = ints(self.N)
+        _, stats = engine.sort(list(data), 'Insertion Sort', inplace=True)
+        self.assertEqual((stats['copies'], stats['bytes_copied']), (0, 0))
+        _, stats = engine.sort(list(data), 'Insertion Sort')
+        self.assertEqual((stats['copies'], stats['bytes_copied']),
+                         (1, self.N * engine.POINTER_SIZE))
+        # merge sort's buffer is its only allocation when sorting in place
+        _, stats = engine.sort(list(data), 'Merge Sort', inplace=True)
+        self.assertEqual(stats['copies'], 1)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            engine.sort([1], 'Nope')
+
+
+class CountingSortTest(unittest.TestCase):
+
+    def test_strategies(self):
+        rng = random.Random(3)
+        cases = {
+            'dense': [rng.randrange(100) for _ in range(1000)],
+            'sparse': [rng.choice((-10 ** 12, 0, 10 ** 12)) for _ in range(1000)],
+            'radix': [rng.getrandbits(63) - 2 ** 62 for _ in range(1000)],
+        }
+        for expected, data in cases.items():
+            for reverse in (False, True):
+                with self.subTest(strategy=expected, reverse=reverse):
+                    out, stats = engine.sort(data, 'Counting Sort', reverse=reverse)
+                    self.assertEqual(stats['strategy'], expected)
+                    self.assertEqual(out, sorted(data, reverse=reverse))
+
+    def test_small_wide_input_stays_cheap(self):
+        data = [random.Random(4).getrandbits(64) for _ in range(10)]
+        out, stats = engine.sort(data, 'Counting Sort')
+        self.assertEqual(out, sorted(data))
+        self.assertLess(stats['bytes_copied'], 1 << 20)
+
+    def test_rejects_non_integer_keys(self):
+        with self.assertRaises(TypeError):
+            engine.sort(['b', 'a'], 'Counting Sort')
+
+    def test_memory_limit(self):
+        with self.assertRaises(MemoryError):
+            engine.sort([0, 10 ** 9], 'Counting Sort', max_memory=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
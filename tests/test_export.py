@@ -0,0 +1,64 @@
+"""Exports read back with ``read_binary`` and the stdlib ``csv`` / ``gzip`` readers.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import csv
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sortlab import export  # noqa: E402
+
+
+class ExportRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        rng = random.Random(0)
+        # more than one BATCH, so several chunks go through the writer thread
+        self.values = sorted(rng.randrange(-2 ** 63, 2 ** 63) for _ in range(export.BATCH + 123))
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_binary(self):
+        for name in ('out.bin', 'out.bin.gz'):
+            with self.subTest(name=name):
+                stats = export.export(self.values, self.path(name))
+                self.assertEqual(export.read_binary(self.path(name)), self.values)
+                self.assertEqual(stats['rows'], len(self.values))
+                self.assertEqual(stats['raw_bytes'], len(export.BIN_MAGIC) + 8 * len(self.values))
+
+    def test_ints(self):
+        for name, opener in (('out.txt', open), ('out.txt.gz', gzip.open)):
+            with self.subTest(name=name):
+                export.export(self.values, self.path(name))
+                with opener(self.path(name), 'rt') as f:
+                    self.assertEqual([int(line) for line in f], self.values)
+
+    def test_csv_rows_written_in_batches(self):
+        rows = [{'ID': str(v), 'LastName': f"N{v % 7}"} for v in self.values]
+        path = self.path('out.csv.gz')
+        with export.Exporter(path) as writer:
+            for i in range(0, len(rows), 1000):
+                writer.write(rows[i:i + 1000])
+        with gzip.open(path, 'rt', newline='') as f:
+            self.assertEqual(list(csv.DictReader(f)), rows)
+
+    def test_not_a_binary_export(self):
+        export.export(self.values[:3], self.path('out.txt'))
+        with self.assertRaises(ValueError):
+            export.read_binary(self.path('out.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
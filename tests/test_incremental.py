@@ -0,0 +1,102 @@
+"""Incremental re-sort across appends and edits, checked against a stable ``sorted``.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sortlab import incremental, loaders  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+class IncrementalSortTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.csv = os.path.join(self.tmp, 'rows.csv')
+        with open(SAMPLE_CSV, 'rb') as f:
+            self.lines = [f.readline() for _ in range(3001)]
+        self.reset()
+
+    def reset(self):
+        """The CSV holds the header and the first 1500 rows again."""
+        for path in (self.csv, os.path.join(self.tmp, 'state')):
+            if os.path.exists(path):
+                os.remove(path)
+        self.append(0, 1501)
+
+    def append(self, start, stop, partial=b''):
+        with open(self.csv, 'ab') as f:
+            f.writelines(self.lines[start:stop])
+            f.write(partial)
+
+    def expected(self, column, reverse, n_rows):
+        rows, _ = loaders.load_csv(self.csv, n_rows=n_rows)
+        return sorted(rows, key=loaders.column_key(column), reverse=reverse)
+
+    def test_appends_match_a_full_sort(self):
+        for column in ('ID', 'LastName'):
+            for algorithm in ('Introsort', 'Counting Sort'):
+                for reverse in (False, True):
+                    with self.subTest(column=column, algorithm=algorithm, reverse=reverse):
+                        self.reset()
+                        state = os.path.join(self.tmp, 'state')
+                        run = lambda: incremental.sort_incremental(  # noqa: E731
+                            self.csv, column, algorithm, reverse, state_file=state)
+                        rows, info = run()
+                        self.assertFalse(info['reused'])
+                        self.assertEqual(rows, self.expected(column, reverse, 1500))
+
+                        # a half-written last line is left for the next run
+                        half = self.lines[2001][:5]
+                        self.append(1501, 2001, half)
+                        rows, info = run()
+                        self.assertTrue(info['reused'])
+                        self.assertEqual((info['previous'], info['delta']), (1500, 500))
+                        self.assertEqual(rows, self.expected(column, reverse, 2000))
+
+                        with open(self.csv, 'ab') as f:
+                            f.write(self.lines[2001][5:])
+                        self.append(2002, 3001)
+                        rows, info = run()
+                        self.assertEqual((info['previous'], info['delta']), (2000, 1000))
+                        self.assertEqual(rows, self.expected(column, reverse, 3000))
+
+                        rows, info = run()
+                        self.assertEqual(info['delta'], 0)
+                        self.assertEqual(rows, self.expected(column, reverse, 3000))
+
+    def test_edited_prefix_rebuilds(self):
+        incremental.sort_incremental(self.csv, 'ID')
+        self.append(1501, 1601)
+        with open(self.csv, 'r+b') as f:
+            f.seek(23)  # a digit of the first ID
+            f.write(b'1')
+        rows, info = incremental.sort_incremental(self.csv, 'ID')
+        self.assertFalse(info['reused'])
+        self.assertEqual(rows, self.expected('ID', False, 1600))
+
+    def test_pickle_is_never_loaded(self):
+        path = incremental.state_path(self.csv, 'ID')
+        with open(path, 'wb') as f:
+            pickle.dump({'version': incremental.STATE_VERSION, 'column': 'ID'}, f)
+        rows, info = incremental.sort_incremental(self.csv, 'ID')
+        self.assertFalse(info['reused'])
+        self.assertEqual(rows, self.expected('ID', False, 1500))
+        with open(path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'SORTLAB-SIDECAR\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Index-only sorting and its saved ``.sortidx``, checked against a stable ``sorted``.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sortlab import index, loaders  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+def copy_lines(src, dst, start, stop):
+    with open(src, 'rb') as f:
+        lines = f.readlines()[start:stop]
+    with open(dst, 'ab') as f:
+        f.writelines(lines)
+
+
+class SortIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.csv = os.path.join(self.tmp, 'rows.csv')
+        copy_lines(SAMPLE_CSV, self.csv, 0, 2001)
+
+    def expected(self, column, reverse, n_rows=None):
+        rows, _ = loaders.load_csv(self.csv, n_rows=n_rows)
+        return sorted(rows, key=loaders.column_key(column), reverse=reverse)
+
+    def sort(self, column, reverse=False, n_rows=None, algorithm='Merge Sort'):
+        sidx, info = index.sorted_index(self.csv, column, algorithm, reverse, n_rows)
+        self.addCleanup(sidx.close)
+        return sidx[:], info
+
+    def test_matches_sorted(self):
+        for column in ('ID', 'FirstName', 'LastName'):
+            for algorithm in ('Merge Sort', 'Counting Sort'):
+                for reverse in (False, True):
+                    with self.subTest(column=column, algorithm=algorithm, reverse=reverse):
+                        rows, _ = self.sort(column, reverse, algorithm=algorithm)
+                        self.assertEqual(rows, self.expected(column, reverse))
+
+    def test_saved_index_is_reused_and_filtered_to_a_prefix(self):
+        self.sort('LastName')
+        rows, info = self.sort('LastName')
+        self.assertTrue(info['reused'])
+        self.assertEqual(rows, self.expected('LastName', False))
+        for n_rows in (1, 1023, 1024, 1500):
+            with self.subTest(n_rows=n_rows):
+                rows, info = self.sort('LastName', n_rows=n_rows)
+                self.assertTrue(info['reused'])
+                self.assertEqual(rows, self.expected('LastName', False, n_rows))
+
+    def test_append_rebuilds(self):
+        self.sort('ID')
+        copy_lines(SAMPLE_CSV, self.csv, 2001, 2501)
+        rows, info = self.sort('ID')
+        self.assertFalse(info['reused'])
+        self.assertEqual(rows, self.expected('ID', False))
+
+    def test_edited_prefix_rebuilds(self):
+        self.sort('ID')
+        with open(self.csv, 'r+b') as f:
+            f.seek(23)  # a digit of the first ID
+            f.write(b'1')
+        rows, info = self.sort('ID')
+        self.assertFalse(info['reused'])
+        self.assertEqual(rows, self.expected('ID', False))
+
+    def test_pickle_is_never_loaded(self):
+        path = index.index_path(self.csv, 'ID')
+        with open(path, 'wb') as f:
+            pickle.dump({'version': index.INDEX_VERSION, 'column': 'ID'}, f)
+        rows, info = self.sort('ID')
+        self.assertFalse(info['reused'])
+        self.assertEqual(rows, self.expected('ID', False))
+        with open(path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'SORTLAB-SIDECAR\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
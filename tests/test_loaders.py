@@ -0,0 +1,107 @@
+"""Loader checks against the stdlib ``csv`` / ``gzip`` / ``bz2`` / ``lzma`` readers.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sortlab import loaders  # noqa: E402
+
+CODECS = {'gz': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+class LoaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def chunk_size(self, size):
+        old = loaders.DECOMPRESS_CHUNK
+        loaders.DECOMPRESS_CHUNK = size
+        self.addCleanup(setattr, loaders, 'DECOMPRESS_CHUNK', old)
+
+
+class DecompressionTest(LoaderTestCase):
+    values = list(range(20000))
+
+    def text(self, values):
+        return ''.join(f"{v}\n" for v in values).encode()
+
+    def test_concatenated_streams_on_a_read_boundary(self):
+        first_half = self.text(self.values[:10000])
+        second_half = self.text(self.values[10000:])
+        for codec, compress in CODECS.items():
+            first = compress(first_half)
+            for padding in (b'', b'\0' * 8):
+                path = self.write(f'multi-{len(padding)}.txt.{codec}',
+                                  first + compress(second_half) + padding)
+                # the first stream ends exactly where a read ends, and at arbitrary points
+                for size in (len(first), 1000, 1 << 20):
+                    with self.subTest(codec=codec, padding=len(padding), chunk=size):
+                        self.chunk_size(size)
+                        self.assertEqual(loaders.read_dataset(path), self.values)
+
+    def test_truncated_stream_raises(self):
+        for codec, compress in CODECS.items():
+            data = compress(self.text(self.values))
+            path = self.write(f'cut.txt.{codec}', data[:-300])
+            with self.subTest(codec=codec):
+                with self.assertRaises(EOFError):
+                    loaders.read_dataset(path)
+
+    def test_truncated_csv_raises(self):
+        header = b'ID,FirstName,LastName\n'
+        body = b''.join(b'%d,Ana,Cruz\n' % i for i in range(5000))
+        for codec, compress in CODECS.items():
+            path = self.write(f'cut.csv.{codec}', compress(header + body)[:-300])
+            with self.subTest(codec=codec):
+                with self.assertRaises(EOFError):
+                    loaders.load_csv(path)
+
+
+class ParallelCsvTest(LoaderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        lines = [b'ID,FirstName,LastName\r\n']
+        lines += [b'%d,Ana,"Cruz, Jr."\r\n' % i if i % 97 == 0 else b'%d,Bruce,Shiro\r\n' % i
+                  for i in range(3000)]
+        # no newline after the last row
+        self.path = self.write('rows.csv', b''.join(lines).rstrip(b'\r\n'))
+        self.rows, _ = loaders.load_csv(self.path)
+
+    def test_matches_load_csv(self):
+        for workers in (1, 2):
+            for chunk_bytes in (1, 1000, 7777, 1 << 20):
+                for n_rows in (None, 0, 1, 1234, 2999, 3000, 5000):
+                    with self.subTest(workers=workers, chunk_bytes=chunk_bytes, n_rows=n_rows):
+                        rows, _ = loaders.load_csv_parallel(self.path, n_rows, workers,
+                                                            chunk_bytes=chunk_bytes)
+                        self.assertEqual(rows, self.rows[:n_rows])
+
+    def test_compressed_falls_back_to_load_csv(self):
+        with open(self.path, 'rb') as f:
+            path = self.write('rows.csv.gz', CODECS['gz'](f.read()))
+        rows, _ = loaders.load_csv_parallel(path, workers=2, chunk_bytes=1000)
+        self.assertEqual(rows, self.rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Online order statistics checked against ``sorted`` and ``bisect`` after every insert.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import bisect
+import io
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sortlab import orderstat  # noqa: E402
+
+
+class OrderStatisticsTest(unittest.TestCase):
+
+    def setUp(self):
+        # small blocks, so a few hundred values already split and rebuild the tree
+        old = orderstat.LOAD
+        orderstat.LOAD = 4
+        self.addCleanup(setattr, orderstat, 'LOAD', old)
+
+    def check(self, stats, expected):
+        self.assertEqual(len(stats), len(expected))
+        self.assertEqual(list(stats), expected)
+        for k in range(-len(expected), len(expected)):
+            self.assertEqual(stats.select(k), expected[k])
+        for x in range(expected[0] - 1, expected[-1] + 2):
+            self.assertEqual(stats.rank(x), bisect.bisect_left(expected, x))
+            self.assertEqual(stats.count(x), expected.count(x))
+        for p in (0, 1, 50, 95, 99.9, 100):
+            self.assertEqual(stats.percentile(p),
+                             expected[max(0, math.ceil(p / 100 * len(expected)) - 1)])
+        for k in (1, 5, len(expected) + 3):
+            self.assertEqual(stats.top(k), expected[::-1][:k])
+            self.assertEqual(stats.top(k, largest=False), expected[:k])
+
+    def test_inserts_match_sorted(self):
+        rng = random.Random(0)
+        for spread in (5, 1000):
+            with self.subTest(spread=spread):
+                stats, expected = orderstat.OrderStatistics(), []
+                for i in range(300):
+                    value = rng.randrange(-spread, spread)
+                    stats.add(value)
+                    bisect.insort(expected, value)
+                    # queries between inserts exercise the incremental tree updates
+                    if i % 7 == 0:
+                        self.check(stats, expected)
+                self.check(stats, expected)
+
+    def test_ascending_and_descending_streams(self):
+        for values in (list(range(200)), list(range(200, 0, -1)), [3] * 50):
+            with self.subTest(first=values[0]):
+                stats = orderstat.OrderStatistics()
+                for v in values:
+                    stats.add(v)
+                self.check(stats, sorted(values))
+
+    def test_bulk_update(self):
+        rng = random.Random(1)
+        values = [rng.randrange(100) for _ in range(500)]
+        stats = orderstat.OrderStatistics(values[:250])
+        stats.update(values[250:])
+        self.check(stats, sorted(values))
+
+    def test_errors(self):
+        stats = orderstat.OrderStatistics()
+        with self.assertRaises(IndexError):
+            stats.percentile(50)
+        with self.assertRaises(IndexError):
+            stats.select(0)
+        self.assertEqual((stats.rank(1), stats.count(1), stats.top(3)), (0, 0, []))
+        stats.update([1, 2])
+        with self.assertRaises(IndexError):
+            stats.select(2)
+        with self.assertRaises(ValueError):
+            stats.percentile(101)
+
+
+class StreamTest(unittest.TestCase):
+
+    def test_partial_lines_wait_for_their_newline(self):
+        f = io.StringIO()
+        values = orderstat.iter_values(orderstat.follow_lines(f))
+        f.write('1\n\n2')
+        f.seek(0)
+        self.assertEqual([next(values), next(values)], [1, None])
+        pos = f.tell()
+        f.write('3\n')
+        f.seek(pos)
+        self.assertEqual([next(values), next(values)], [23, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
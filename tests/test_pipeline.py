@@ -0,0 +1,81 @@
+"""Pipelined load-and-sort, checked against a stable ``sorted`` of ``load_csv``.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sortlab import loaders, pipeline  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+class PipelineSortTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.csv = os.path.join(cls.tmp, 'rows.csv')
+        with open(SAMPLE_CSV, 'rb') as src, open(cls.csv, 'wb') as dst:
+            for _ in range(2501):
+                dst.write(src.readline())
+        cls.rows, _ = loaders.load_csv(cls.csv)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def expected(self, column, reverse, n_rows=None):
+        return sorted(self.rows[:n_rows], key=loaders.column_key(column), reverse=reverse)
+
+    def test_matches_sorted(self):
+        for column in ('ID', 'FirstName', 'LastName'):
+            for algorithm in ('Merge Sort', 'Counting Sort'):
+                for reverse in (False, True):
+                    for n_rows in (None, 999):
+                        with self.subTest(column=column, algorithm=algorithm, reverse=reverse,
+                                          n_rows=n_rows):
+                            rows, info = pipeline.pipeline_sort(self.csv, algorithm, column, n_rows,
+                                                                reverse, batch_rows=400)
+                            self.assertEqual(rows, self.expected(column, reverse, n_rows))
+                            self.assertEqual(info['rows'], len(rows))
+                            self.assertEqual(info['batches'], -(-len(rows) // 400))
+
+    def test_one_batch_is_not_merged(self):
+        rows, info = pipeline.pipeline_sort(self.csv, 'Introsort', 'LastName', 300)
+        self.assertEqual(rows, self.expected('LastName', False, 300))
+        self.assertEqual(info['batches'], 1)
+
+    def test_sorter_processes(self):
+        rows, info = pipeline.pipeline_sort(self.csv, 'Counting Sort', 'LastName', reverse=True,
+                                            batch_rows=500, sorters=2)
+        self.assertEqual(rows, self.expected('LastName', True))
+        self.assertEqual(info['batches'], 5)
+
+    def test_streamed_to_file(self):
+        for column in ('ID', 'LastName'):
+            for reverse in (False, True):
+                with self.subTest(column=column, reverse=reverse):
+                    out_path = os.path.join(self.tmp, f"{column}-{reverse}.csv")
+                    rows, info = pipeline.pipeline_sort(self.csv, 'Counting Sort', column,
+                                                        reverse=reverse, batch_rows=400,
+                                                        out_path=out_path)
+                    expected = self.expected(column, reverse)
+                    self.assertIsNone(rows)
+                    self.assertEqual(info['head'], expected[:pipeline.HEAD_ROWS])
+                    self.assertEqual(info['write']['rows'], len(expected))
+                    with open(out_path, newline='', encoding='utf-8') as f:
+                        self.assertEqual(list(csv.DictReader(f)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
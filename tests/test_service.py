@@ -0,0 +1,100 @@
+"""Sort service over real HTTP, results checked against ``sorted``.
+
+Run from the repository root::
+
+    python -m unittest discover -s tests
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from sortlab import loaders, service  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, 'PRELIM-EXAM', 'data', 'generated_data.csv')
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+                 + payload)
+    await writer.drain()
+    head, _, rest = (await reader.read()).partition(b'\r\n\r\n')
+    writer.close()
+    return int(head.split()[1]), json.loads(rest)
+
+
+class SortServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = service.SortService(workers=1, max_queue=2, max_finished=3)
+        await self.service.start()
+        self.server = await asyncio.start_server(self.service.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+
+    async def wait(self, job_id):
+        while True:
+            status, job = await request(self.port, 'GET', f'/jobs/{job_id}')
+            if job['status'] in service.FINISHED:
+                return job
+            await asyncio.sleep(0.01)
+
+    async def test_jobs_match_sorted(self):
+        data = [random.Random(0).randrange(-10 ** 6, 10 ** 6) for _ in range(5000)]
+        rows, _ = loaders.load_csv(SAMPLE_CSV, n_rows=3000)
+        cases = [
+            ({'data': data, 'algorithm': 'Counting Sort', 'reverse': True, 'top_k': 20},
+             sorted(data, reverse=True)),
+            ({'path': SAMPLE_CSV, 'algorithm': 'Introsort', 'column': 'LastName', 'n': 3000},
+             sorted(rows, key=loaders.column_key('LastName'))),
+        ]
+        for spec, expected in cases:
+            with self.subTest(algorithm=spec['algorithm']):
+                status, job = await request(self.port, 'POST', '/jobs', spec)
+                self.assertEqual(status, 202)
+                job = await self.wait(job['id'])
+                self.assertEqual(job['status'], 'done')
+                self.assertEqual(job['result']['n'], len(expected))
+                self.assertEqual(job['result']['top'], expected[:spec.get('top_k', 10)])
+
+    async def test_rejected_jobs_take_no_id(self):
+        # nothing is dispatched until the event loop runs, so the queue fills up
+        ids = [self.service.submit({'data': [3, 1, 2]})['id'] for _ in range(2)]
+        with self.assertRaises(service.QueueFull):
+            self.service.submit({'data': [1]})
+        for job_id in ids:
+            await self.wait(job_id)
+        status, job = await request(self.port, 'POST', '/jobs', {'data': [2, 1]})
+        self.assertEqual((status, ids, job['id']), (202, ['1', '2'], '3'))
+
+    async def test_finished_jobs_are_evicted(self):
+        ids = []
+        for i in range(5):
+            _, job = await request(self.port, 'POST', '/jobs', {'data': [i, 0]})
+            ids.append(job['id'])
+            await self.wait(job['id'])
+        self.assertEqual(list(self.service.jobs), ids[-3:])
+        status, _ = await request(self.port, 'GET', f'/jobs/{ids[0]}')
+        self.assertEqual(status, 404)
+
+        self.service.job_ttl = 0.0
+        _, job = await request(self.port, 'POST', '/jobs', {'data': [1]})
+        # the job's own finish evicts it along with every older job
+        while job['id'] in self.service.jobs:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.service.jobs, {})
+
+
+if __name__ == '__main__':
+    unittest.main()